@@ -32,12 +32,13 @@ class CentralizedCacheManager:
         except Exception as e:
             logger.warning(f"Cache index creation warning: {e}")
     
-    def _serialize_data(self, data: Any) -> Any:
+    @staticmethod
+    def _serialize_data(data: Any) -> Any:
         """Serialize data to be JSON compatible"""
         if isinstance(data, dict):
-            return {k: self._serialize_data(v) for k, v in data.items()}
+            return {k: CentralizedCacheManager._serialize_data(v) for k, v in data.items()}
         elif isinstance(data, list):
-            return [self._serialize_data(item) for item in data]
+            return [CentralizedCacheManager._serialize_data(item) for item in data]
         elif isinstance(data, ObjectId):
             return str(data)
         elif isinstance(data, datetime):
@@ -45,7 +46,8 @@ class CentralizedCacheManager:
         else:
             return data
     
-    def set(self, key: str, data: Any, expiry_days: int = 5, cache_type: str = "general") -> bool:
+    def set(self, key: str, data: Any, expiry_days: int = 5, cache_type: str = "general",
+            expiry_seconds: Optional[int] = None) -> bool:
         """
         Store data in cache with expiration
         
@@ -54,6 +56,7 @@ class CentralizedCacheManager:
             data: Data to cache
             expiry_days: Number of days until expiration (default: 5)
             cache_type: Type of cache for organization (e.g., 'profile', 'resume', 'job')
+            expiry_seconds: Short-lived expiration in seconds, overrides expiry_days when given
             
         Returns:
             bool: Success status
@@ -63,13 +66,15 @@ class CentralizedCacheManager:
             serialized_data = self._serialize_data(data)
             
             # Create cache document
+            now = datetime.now()
+            lifetime = timedelta(seconds=expiry_seconds) if expiry_seconds is not None else timedelta(days=expiry_days)
             cache_document = {
                 'cache_key': key,
                 'cache_type': cache_type,
                 'data': serialized_data,
-                'cached_at': datetime.now(),
-                'expires_at': datetime.now() + timedelta(days=expiry_days),
-                'expiry_days': expiry_days
+                'cached_at': now,
+                'expires_at': now + lifetime,
+                'expiry_days': expiry_days if expiry_seconds is None else round(expiry_seconds / 86400, 4)
             }
             
             # Use upsert to replace existing cache
@@ -79,7 +84,7 @@ class CentralizedCacheManager:
                 upsert=True
             )
             
-            logger.info(f"Cached data for key: {key} (type: {cache_type}, expires in {expiry_days} days)")
+            logger.info(f"Cached data for key: {key} (type: {cache_type}, expires in {lifetime})")
             return True
             
         except Exception as e:
@@ -306,9 +311,10 @@ def init_cache_manager(db_connection):
     return cache_manager
 
 # Convenience functions for common cache operations
-def cache_set(key: str, data: Any, expiry_days: int = 5, cache_type: str = "general") -> bool:
+def cache_set(key: str, data: Any, expiry_days: int = 5, cache_type: str = "general",
+              expiry_seconds: Optional[int] = None) -> bool:
     """Convenience function to set cache data"""
-    return get_cache_manager().set(key, data, expiry_days, cache_type)
+    return get_cache_manager().set(key, data, expiry_days, cache_type, expiry_seconds)
 
 def cache_get(key: str) -> Optional[Any]:
     """Convenience function to get cache data"""
@@ -321,3 +327,7 @@ def cache_delete(key: str) -> bool:
 def cache_exists(key: str) -> bool:
     """Convenience function to check if cache exists"""
     return get_cache_manager().exists(key)
+
+def cache_serialize(data: Any) -> Any:
+    """Convert data to the shape cache_get returns for it (ObjectId and datetime as strings)"""
+    return CentralizedCacheManager._serialize_data(data)
@@ -8,7 +8,7 @@ from pymongo import MongoClient
 import logging
 
 class ColdEmailGenerator:
-    def __init__(self):
+    def __init__(self, mongo_client: Optional[MongoClient] = None):
         """Initialize cold email generator with Gemini."""
         load_dotenv()
         try:
@@ -19,7 +19,7 @@ class ColdEmailGenerator:
             self.embed_model = genai.GenerativeModel('embedding-001')
             
             # Initialize MongoDB
-            self.mongo_client = MongoClient("mongodb://127.0.0.1:27017")
+            self.mongo_client = mongo_client or MongoClient("mongodb://127.0.0.1:27017")
             self.db = self.mongo_client["resumeDB"]
             
 
@@ -9,7 +9,8 @@ import logging
 
 
 class CoverLetterGenerator:
-    def __init__(self, chroma_client: Optional[chromadb.Client] = None, api_key: Optional[str] = None):
+    def __init__(self, chroma_client: Optional[chromadb.Client] = None, api_key: Optional[str] = None,
+                 mongo_client: Optional[MongoClient] = None):
         """Initialize the cover letter generator."""
         load_dotenv()
         
@@ -24,7 +25,7 @@ class CoverLetterGenerator:
             self.model = genai.GenerativeModel('gemini-2.0-flash')
             
             # Initialize MongoDB
-            self.mongo_client = MongoClient("mongodb://127.0.0.1:27017")
+            self.mongo_client = mongo_client or MongoClient("mongodb://127.0.0.1:27017")
             self.db = self.mongo_client["resumeDB"]
             
  
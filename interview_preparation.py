@@ -13,7 +13,8 @@ import json
 import re
 
 class InterviewPreparation:
-    def __init__(self, chroma_client: Optional[chromadb.Client] = None):
+    def __init__(self, chroma_client: Optional[chromadb.Client] = None, mongo_client: Optional[MongoClient] = None,
+                 http_session: Optional[requests.Session] = None):
         """Initialize interview preparation system."""
         load_dotenv()
         
@@ -23,8 +24,11 @@ class InterviewPreparation:
             genai.configure(api_key=self.gemini_key)
             self.model = genai.GenerativeModel('gemini-2.0-flash')
             
+            # Reuse the caller's pooled session so scraping keeps connections alive
+            self.http_session = http_session or requests.Session()
+            
             # Initialize MongoDB
-            self.mongo_client = MongoClient("mongodb://127.0.0.1:27017")
+            self.mongo_client = mongo_client or MongoClient("mongodb://127.0.0.1:27017")
             self.db = self.mongo_client["resumeDB"]
             self.interviews = self.db["interview_prep"]
             
@@ -291,6 +295,138 @@ class InterviewPreparation:
             }
         ]
 
+    def _generate_guide_questions(self, resume_data: Dict, job_analysis: Dict) -> Dict:
+        """Generate technical, behavioral, system design and coding questions in a single model call"""
+        defaults = {
+            'technical_screen': self._get_default_technical_questions(),
+            'behavioral': self._get_default_behavioral_questions(),
+            'system_design': self._get_default_system_design_questions(),
+            'coding': self._get_default_coding_questions()
+        }
+        try:
+            parsed_data = resume_data.get('parsed_data', {})
+            skills = parsed_data.get('skills', [])
+            experience_level = self._determine_experience_level(resume_data)
+            
+            # Handle skills if it's a dict
+            if isinstance(skills, dict):
+                skills_list = []
+                for skill_category, skill_values in skills.items():
+                    if isinstance(skill_values, list):
+                        skills_list.extend(skill_values)
+                    elif isinstance(skill_values, str):
+                        skills_list.append(skill_values)
+                skills = skills_list
+        
+            skills_text = ', '.join(skills[:10]) if skills else 'General programming skills'
+
+            prompt = f"""
+            Prepare interview questions for a {experience_level} level candidate with these skills:
+            {skills_text}
+
+            Experience: {json.dumps(parsed_data.get('experience', []), ensure_ascii=False)}
+
+            Job Requirements:
+            {json.dumps(job_analysis, indent=2) if job_analysis else 'General requirements'}
+
+            Return ONLY a valid JSON object with this exact structure:
+            {{
+                "technical_screen": {{
+                    "core_concepts": [
+                        {{
+                            "question": "What is your experience with Python?",
+                            "expected_points": ["Specific examples", "Years of experience"],
+                            "follow_up": ["Can you explain a challenging project?"],
+                            "difficulty": "medium"
+                        }}
+                    ],
+                    "problem_solving": [
+                        {{
+                            "question": "How do you approach debugging?",
+                            "expected_points": ["Systematic approach", "Tools used"],
+                            "follow_up": ["Describe a difficult bug you solved"],
+                            "difficulty": "medium"
+                        }}
+                    ]
+                }},
+                "behavioral": {{
+                    "leadership": [
+                        {{
+                            "question": "Tell me about a time you led a project",
+                            "star_guide": "Focus on your leadership style and team impact",
+                            "key_points": ["Decision making", "Team motivation", "Results"]
+                        }}
+                    ],
+                    "teamwork": [
+                        {{
+                            "question": "Describe a successful team collaboration",
+                            "star_guide": "Highlight your collaboration skills",
+                            "key_points": ["Communication", "Support", "Shared goals"]
+                        }}
+                    ],
+                    "problem_solving": [
+                        {{
+                            "question": "Tell me about a technical challenge you overcame",
+                            "star_guide": "Show your analytical thinking process",
+                            "key_points": ["Problem analysis", "Solution approach", "Results"]
+                        }}
+                    ]
+                }},
+                "system_design": [
+                    {{
+                        "title": "Design a URL Shortener",
+                        "description": "Design a system like bit.ly that shortens URLs",
+                        "difficulty": "medium",
+                        "concepts": ["System Design", "Databases", "Caching"],
+                        "key_components": ["Load Balancer", "Database", "Cache"],
+                        "scalability_aspects": ["Horizontal scaling", "Database sharding"],
+                        "discussion_points": ["How would you handle millions of requests?", "Caching strategy"],
+                        "follow_up_questions": ["How would you handle analytics?"],
+                        "estimated_time": "45-60 minutes"
+                    }}
+                ],
+                "coding": [
+                    {{
+                        "title": "Array Sum Problem",
+                        "description": "Find two numbers that add up to target",
+                        "difficulty": "easy",
+                        "concepts": ["Arrays", "Hash Tables"],
+                        "time_complexity": "O(n)",
+                        "space_complexity": "O(n)",
+                        "approach": "Use hash table for lookup",
+                        "follow_up": ["What if array is sorted?"],
+                        "sample_input": "[2,7,11,15], target=9",
+                        "sample_output": "[0,1]"
+                    }}
+                ]
+            }}
+
+            Make sure the JSON is valid with no trailing commas.
+            """
+
+            response = self.model.generate_content(
+                prompt,
+                generation_config={
+                    'temperature': 0.3,
+                    'top_p': 1,
+                    'top_k': 32,
+                    'max_output_tokens': 8192
+                }
+            )
+
+            questions = self._parse_json_safely(response.text) if response.text else {}
+
+            # Fall back per section so one malformed part doesn't discard the rest
+            expected_types = {'technical_screen': dict, 'behavioral': dict, 'system_design': list, 'coding': list}
+            return {
+                key: questions[key] if isinstance(questions.get(key), expected) and questions[key] else defaults[key]
+                for key, expected in expected_types.items()
+            }
+
+        except Exception as e:
+            logging.error(f"Interview guide questions generation error: {str(e)}")
+            return defaults
+
     def prepare_interview_guide(self, resume_data: Dict, job_description: str, company_name: str) -> Dict:
         """Generate comprehensive interview preparation guide"""
         try:
@@ -300,11 +436,12 @@ class InterviewPreparation:
             # Analyze job requirements
             job_analysis = self._analyze_job_requirements(job_description)
 
-            # Generate all components
-            technical_questions = self._generate_technical_screen_questions(resume_data, job_analysis)
-            behavioral_questions = self._generate_behavioral_questions(resume_data, job_analysis)
-            system_design = self._generate_system_design_questions(job_analysis)
-            coding_questions = self._generate_coding_questions(resume_data, job_analysis)
+            # Generate all question sets in one model round-trip
+            questions = self._generate_guide_questions(resume_data, job_analysis)
+            technical_questions = questions['technical_screen']
+            behavioral_questions = questions['behavioral']
+            system_design = questions['system_design']
+            coding_questions = questions['coding']
             
             # Create the guide structure that matches what the HTML expects
             guide = {
@@ -418,7 +555,7 @@ class InterviewPreparation:
 
             for source in sources:
                 try:
-                    response = requests.get(source, 
+                    response = self.http_session.get(source, 
                                         headers={'User-Agent': 'Mozilla/5.0'})
                     if response.status_code == 200:
                         soup = BeautifulSoup(response.text, 'html.parser')
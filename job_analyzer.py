@@ -1,39 +1,400 @@
 #writes cover letter
 
+import copy
 import json
-#import spacy
-from typing import Dict, List, Tuple, Any
+import asyncio
+import logging
+import hashlib
+import threading
+import time
+import orjson
+from cachetools import TLRUCache
+from typing import Dict, List, Tuple, Any, Union, Optional
+from pydantic import BaseModel, ConfigDict, ValidationError
 from bs4 import BeautifulSoup
 import requests
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import chromadb
+import pybreaker
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pymongo import MongoClient
-# import cohere
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
+import sys
 from dotenv import load_dotenv
 import re
+from urllib.parse import quote, quote_plus
 import google.generativeai as genai
 from google.generativeai.types import content_types
 
+logger = logging.getLogger(__name__)
+
+# Seconds that analytics computed for an identical resume are reused
+ANALYTICS_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Seconds that stored resume analytics are served before recalculating
+RESUME_ANALYTICS_TTL = 24 * 60 * 60
+
+# Seconds to wait for another request's analytics calculation before running our own
+ANALYTICS_INFLIGHT_TIMEOUT = 90
+
+# Output budget per analysed resume; the schema-shaped JSON is typically ~700 tokens
+ANALYTICS_MAX_OUTPUT_TOKENS = 1536
+
+# Upper bound on concurrent analytics Gemini calls per process
+GEMINI_MAX_CONCURRENCY = 16
+
+# (connect, read) timeout in seconds for outbound scraping requests
+SCRAPE_TIMEOUT = (3.05, 8)
+
+# Salary page links and figures looked for in scraped HTML
+SALARY_SITE_PATTERNS = {
+    'glassdoor': re.compile(r'glassdoor\.com.*salary'),
+    'indeed': re.compile(r'indeed\.com.*salary'),
+    'payscale': re.compile(r'payscale\.com.*salary')
+}
+SALARY_RANGE_PATTERN = re.compile(r'\$[\d,]+\s*-\s*\$[\d,]+')
+SALARY_AMOUNT_PATTERN = re.compile(r'\$[\d,]+')
+
+# Resume analytics prompt, built once; only the resume JSON is spliced in per call.
+# The response structure is enforced by ANALYTICS_SCHEMA rather than an inline example.
+_ANALYTICS_PROMPT_HEAD = """Analyze this resume comprehensively and provide detailed analytics:
+
+Resume Data: """
+
+_ANALYTICS_GUIDELINES = """Analyze based on:
+1. ATS compatibility (keywords, format, structure)
+2. Market demand for skills
+3. Experience progression and achievements
+4. Salary potential based on skills and experience
+5. Job role matches with realistic percentages
+6. Specific improvement recommendations
+7. Current market trends and insights
+
+Ensure all scores are realistic (0-100) and suggestions are actionable.
+"""
+
+_ANALYTICS_PROMPT_TAIL = "\n\n" + _ANALYTICS_GUIDELINES
+
+def _schema_object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Gemini response schema for an object whose properties are all required"""
+    return {'type': 'OBJECT', 'properties': properties, 'required': list(properties)}
+
+_SCHEMA_STRING = {'type': 'STRING'}
+_SCHEMA_NUMBER = {'type': 'NUMBER'}
+_SCHEMA_STRING_LIST = {'type': 'ARRAY', 'items': _SCHEMA_STRING}
+
+# Gemini structured-output schema for resume analytics (mirrors ResumeAnalytics)
+ANALYTICS_SCHEMA = _schema_object({
+    'ats_score': _schema_object({
+        'overall': _SCHEMA_NUMBER,
+        'breakdown': _schema_object({
+            key: _SCHEMA_NUMBER for key in ('format', 'keywords', 'experience', 'skills', 'education')
+        }),
+        'recommendations': _SCHEMA_STRING_LIST
+    }),
+    'job_matches': {'type': 'ARRAY', 'items': _schema_object({
+        'role': _SCHEMA_STRING,
+        'match_percentage': _SCHEMA_NUMBER,
+        'salary_range': _SCHEMA_STRING,
+        'market_demand': _SCHEMA_STRING
+    })},
+    'salary_analysis': _schema_object({
+        key: _SCHEMA_STRING
+        for key in ('estimated_range', 'market_average', 'experience_level', 'location_factor', 'growth_potential')
+    }),
+    'skills_analysis': _schema_object({
+        'technical_skills': _schema_object({
+            'strengths': _SCHEMA_STRING_LIST,
+            'in_demand': _SCHEMA_STRING_LIST,
+            'missing': _SCHEMA_STRING_LIST
+        }),
+        'soft_skills': _schema_object({
+            'identified': _SCHEMA_STRING_LIST,
+            'recommended': _SCHEMA_STRING_LIST
+        })
+    }),
+    'experience_analysis': _schema_object({
+        'total_years': _SCHEMA_NUMBER,
+        'progression': _SCHEMA_STRING,
+        'industry_relevance': _SCHEMA_STRING,
+        'achievements_quantified': _SCHEMA_NUMBER,
+        'recommendations': _SCHEMA_STRING_LIST
+    }),
+    'profile_completeness': _schema_object({
+        'overall': _SCHEMA_NUMBER,
+        'sections': _schema_object({
+            key: _SCHEMA_NUMBER
+            for key in ('personal_info', 'experience', 'skills', 'education', 'projects', 'certifications')
+        }),
+        'missing_sections': _SCHEMA_STRING_LIST
+    }),
+    'improvement_suggestions': {'type': 'ARRAY', 'items': _schema_object({
+        'priority': {'type': 'STRING', 'enum': ['High', 'Medium', 'Low']},
+        'category': _SCHEMA_STRING,
+        'suggestion': _SCHEMA_STRING,
+        'impact': _SCHEMA_STRING
+    })},
+    'market_insights': _schema_object({
+        'industry_trends': _SCHEMA_STRING_LIST,
+        'salary_trends': _SCHEMA_STRING,
+        'job_availability': _SCHEMA_STRING
+    })
+})
+
+# Fallback analytics served when calculation fails
+_DEFAULT_ANALYTICS_TEMPLATE = {
+    "ats_score": {
+        "overall": 70,
+        "breakdown": {
+            "format": 80,
+            "keywords": 60,
+            "experience": 70,
+            "skills": 75,
+            "education": 85
+        },
+        "recommendations": ["Add more quantified achievements", "Include industry keywords"]
+    },
+    "job_matches": [
+        {
+            "role": "Software Engineer",
+            "match_percentage": 75,
+            "salary_range": "$70,000-$90,000",
+            "market_demand": "High"
+        },
+        {
+            "role": "Developer",
+            "match_percentage": 70,
+            "salary_range": "$65,000-$85,000",
+            "market_demand": "Medium-High"
+        }
+    ],
+    "salary_analysis": {
+        "estimated_range": "$70,000-$90,000",
+        "market_average": "$80,000",
+        "experience_level": "Mid-level",
+        "location_factor": "United States",
+        "growth_potential": "10% annually"
+    },
+    "skills_analysis": {
+        "technical_skills": {
+            "strengths": [],
+            "in_demand": ["Cloud Computing", "Machine Learning"],
+            "missing": ["Advanced frameworks"]
+        },
+        "soft_skills": {
+            "identified": ["Communication"],
+            "recommended": ["Leadership", "Project Management"]
+        }
+    },
+    "experience_analysis": {
+        "total_years": 2,
+        "progression": "Good",
+        "industry_relevance": "Medium",
+        "achievements_quantified": 50,
+        "recommendations": ["Add more metrics", "Highlight achievements"]
+    },
+    "profile_completeness": {
+        "overall": 70,
+        "sections": {
+            "personal_info": 90,
+            "experience": 70,
+            "skills": 75,
+            "education": 80,
+            "projects": 60,
+            "certifications": 30
+        },
+        "missing_sections": ["Certifications", "Projects"]
+    },
+    "improvement_suggestions": [
+        {
+            "priority": "High",
+            "category": "Content",
+            "suggestion": "Add more quantified achievements",
+            "impact": "Improve ATS score"
+        }
+    ],
+    "market_insights": {
+        "industry_trends": ["Technology skills in demand"],
+        "salary_trends": "Stable growth",
+        "job_availability": "Good opportunities available"
+    },
+    "version": "1.0"
+}
+_DEFAULT_ANALYTICS_BYTES = orjson.dumps(_DEFAULT_ANALYTICS_TEMPLATE)
+
+
+# Schema the Gemini analytics response is validated against; unknown extra fields are kept
+Score = Union[int, float]
+
+class _AnalyticsSection(BaseModel):
+    model_config = ConfigDict(extra='allow')
+
+class AtsScore(_AnalyticsSection):
+    overall: Score
+    breakdown: Dict[str, Score] = {}
+    recommendations: List[str] = []
+
+class JobMatch(_AnalyticsSection):
+    role: str
+    match_percentage: Score = 0
+    salary_range: str = ''
+    market_demand: str = ''
+
+class SalaryAnalysis(_AnalyticsSection):
+    estimated_range: str = ''
+    market_average: str = ''
+    experience_level: str = ''
+    location_factor: str = ''
+    growth_potential: str = ''
+
+class TechnicalSkills(_AnalyticsSection):
+    strengths: List[str] = []
+    in_demand: List[str] = []
+    missing: List[str] = []
+
+class SoftSkills(_AnalyticsSection):
+    identified: List[str] = []
+    recommended: List[str] = []
+
+class SkillsAnalysis(_AnalyticsSection):
+    technical_skills: TechnicalSkills = TechnicalSkills()
+    soft_skills: SoftSkills = SoftSkills()
+
+class ExperienceAnalysis(_AnalyticsSection):
+    total_years: Score = 0
+    progression: str = ''
+    industry_relevance: str = ''
+    achievements_quantified: Score = 0
+    recommendations: List[str] = []
+
+class ProfileCompleteness(_AnalyticsSection):
+    overall: Score = 0
+    sections: Dict[str, Score] = {}
+    missing_sections: List[str] = []
+
+class ImprovementSuggestion(_AnalyticsSection):
+    priority: str = 'Medium'
+    category: str = ''
+    suggestion: str
+    impact: str = ''
+
+class MarketInsights(_AnalyticsSection):
+    industry_trends: List[str] = []
+    salary_trends: str = ''
+    job_availability: str = ''
+
+class ResumeAnalytics(_AnalyticsSection):
+    ats_score: AtsScore
+    job_matches: List[JobMatch] = []
+    salary_analysis: SalaryAnalysis = SalaryAnalysis()
+    skills_analysis: SkillsAnalysis = SkillsAnalysis()
+    experience_analysis: ExperienceAnalysis = ExperienceAnalysis()
+    profile_completeness: ProfileCompleteness = ProfileCompleteness()
+    improvement_suggestions: List[ImprovementSuggestion] = []
+    market_insights: MarketInsights = MarketInsights()
+
 class JobAnalyzer:
-    def __init__(self):
+    # Per-site circuit breakers, shared by all instances so failures are remembered across calls
+    _breakers = {
+        site: pybreaker.CircuitBreaker(fail_max=5, reset_timeout=60)
+        for site in ('google', 'glassdoor', 'indeed', 'payscale')
+    }
+
+    def __init__(self, mongo_client: Optional[MongoClient] = None):
         load_dotenv()
-        #self.nlp = spacy.load("en_core_web_lg")
         genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
         self.model = genai.GenerativeModel('gemini-2.0-flash')
+
+        # Analytics generation config, built once and reused for every call
+        self._analytics_gen_cfg = genai.types.GenerationConfig(
+            temperature=0.3,  # Lower temperature for consistent analysis
+            top_p=0.8,
+            top_k=20,
+            max_output_tokens=ANALYTICS_MAX_OUTPUT_TOKENS,
+            response_mime_type='application/json',
+            response_schema=ANALYTICS_SCHEMA
+        )
         
         # Initialize MongoDB
-        self.mongo_client = MongoClient("mongodb://127.0.0.1:27017")
+        # Analytics/resume payloads are large, compressible JSON: compress them on the wire
+        self.mongo_client = mongo_client or MongoClient("mongodb://127.0.0.1:27017", compressors="zstd,zlib")
         self.db = self.mongo_client["resumeDB"]
         
         # Collections
         self.resumes = self.db["resumes"]
         self.job_matches = self.db["job_matches"]
+        self.analytics_coll = self.db["resume_analytics"]
+        self.analytics_coll.create_index("analytics_expires_at")
+        self.analytics_coll.create_index([("analytics.skills_analysis.technical_skills.missing", 1)])
+        self.analytics_coll.create_index([("analytics.ats_score.overall", -1)])
+        self.analytics_coll.create_index([("analytics_updated", -1)])
+        self.analytics_cache = self.db["resume_analytics_cache"]
+        self.analytics_cache.create_index("hash", unique=True)
+
+        # In-process cache of fresh resume analytics: resume_id -> (analytics, expires_at epoch)
+        self._analytics_lru = TLRUCache(maxsize=1024, ttu=lambda _key, value, _now: value[1], timer=time.time)
+        self._analytics_lru_lock = threading.Lock()
+
+        # Analytics calculations in progress: resume_id -> Event set when done
+        self._inflight: Dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
+        self._gemini_slots = threading.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+        # Identical Gemini lookups in progress: key -> {'event', 'result'} shared with concurrent callers
+        self._coalesced: Dict[Tuple, Dict[str, Any]] = {}
+        self._coalesce_lock = threading.Lock()
+
+        # Shared HTTP session so scrapers reuse pooled keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+
+    @property
+    def http_session(self) -> requests.Session:
+        """Pooled HTTP session that other components can share for outbound requests"""
+        return self._session
+
+    def _coalesce(self, key: Tuple, compute) -> Any:
+        """Run compute once for concurrent callers with the same key; the rest reuse its result"""
+        with self._coalesce_lock:
+            call = self._coalesced.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._coalesced[key] = {'event': threading.Event(), 'result': None}
+
+        if not is_leader:
+            if call['event'].wait(ANALYTICS_INFLIGHT_TIMEOUT):
+                return copy.deepcopy(call['result'])
+            # The leading call is stuck, so do the work ourselves
+            return compute()
+
+        try:
+            with self._gemini_slots:
+                call['result'] = compute()
+            return call['result']
+        finally:
+            with self._coalesce_lock:
+                self._coalesced.pop(key, None)
+            call['event'].set()
 
     def get_similar_jobs_sync(self, job_description: str, company: str = '') -> List[Dict]:
         """Get similar jobs based on description"""
+        return self._coalesce(
+            ('similar_jobs', job_description, company),
+            lambda: self._generate_similar_jobs(job_description, company)
+        )
+
+    def _generate_similar_jobs(self, job_description: str, company: str) -> List[Dict]:
+        """Ask Gemini for similar jobs"""
         try:
             # Use Gemini to find similar jobs
             prompt = f"""
@@ -79,6 +440,13 @@ class JobAnalyzer:
 
     def get_industry_insights_sync(self, job_title: str, industry: str) -> List[Dict]:
         """Get industry insights for the job"""
+        return self._coalesce(
+            ('industry_insights', job_title, industry),
+            lambda: self._generate_industry_insights(job_title, industry)
+        )
+
+    def _generate_industry_insights(self, job_title: str, industry: str) -> List[Dict]:
+        """Ask Gemini for industry insights"""
         try:
             prompt = f"""
             Provide industry insights for this role:
@@ -149,7 +517,7 @@ class JobAnalyzer:
             return [{
                 'title': job_title,
                 'company': 'Various Companies',
-                'url': f'https://www.linkedin.com/jobs/search/?keywords={job_title.replace(" ", "%20")}'
+                'url': f'https://www.linkedin.com/jobs/search/?keywords={quote(job_title)}'
             }]
         except Exception as e:
             print(f"LinkedIn scraping error: {str(e)}")
@@ -161,7 +529,7 @@ class JobAnalyzer:
             return [{
                 'title': job_title,
                 'company': 'Various Companies',
-                'url': f'https://www.indeed.com/jobs?q={job_title.replace(" ", "+")}'
+                'url': f'https://www.indeed.com/jobs?q={quote_plus(job_title)}'
             }]
         except Exception as e:
             print(f"Indeed scraping error: {str(e)}")
@@ -173,7 +541,7 @@ class JobAnalyzer:
             return [{
                 'title': job_title,
                 'company': 'Various Companies',
-                'url': f'https://www.glassdoor.com/Job/jobs.htm?sc.keyword={job_title.replace(" ", "+")}'
+                'url': f'https://www.glassdoor.com/Job/jobs.htm?sc.keyword={quote_plus(job_title)}'
             }]
         except Exception as e:
             print(f"Glassdoor scraping error: {str(e)}")
@@ -185,7 +553,7 @@ class JobAnalyzer:
             return [{
                 'title': job_title,
                 'company': 'Various Companies',
-                'url': f'https://stackoverflow.com/jobs?q={job_title.replace(" ", "+")}'
+                'url': f'https://stackoverflow.com/jobs?q={quote_plus(job_title)}'
             }]
         except Exception as e:
             print(f"StackOverflow scraping error: {str(e)}")
@@ -222,7 +590,7 @@ class JobAnalyzer:
                 },
                 {
                     'name': 'Salary Trends',
-                    'url': f'https://www.payscale.com/research/US/Job={job_title.replace(" ", "_")}'
+                    'url': f'https://www.payscale.com/research/US/Job={quote(job_title.replace(" ", "_"))}'
                 }
             ]
         }
@@ -238,6 +606,10 @@ class JobAnalyzer:
 
     def analyze_job_sync(self, job_description: str, resume_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Enhanced job analysis with culture fit and career path"""
+        return asyncio.run(self.analyze_job(job_description, resume_data))
+
+    async def analyze_job(self, job_description: str, resume_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run the Gemini analysis, then fan out the independent scraping steps"""
         try:
             prompt = f"""
             Analyze this job description in detail:
@@ -275,17 +647,18 @@ class JobAnalyzer:
             }}
             """
 
-            response = self.model.generate_content(prompt)
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
             analysis = json.loads(response.text[response.text.find('{'):response.text.rfind('}')+1])
 
-            # Add real salary data from scraping
-            salary_data = self._scrape_salary_data(analysis['position']['title'])
-            analysis['salary_data'] = salary_data
-
-            # Add real company reviews
+            # Salary scraping and company research are independent I/O, run them together
+            tasks = [self._scrape_salary_data_async(analysis['position']['title'])]
             if 'company_name' in analysis:
-                company_reviews = self._scrape_company_reviews(analysis['company_name'])
-                analysis['company_reviews'] = company_reviews
+                tasks.append(asyncio.to_thread(self._get_company_insights, analysis['company_name']))
+            results = await asyncio.gather(*tasks)
+
+            analysis['salary_data'] = results[0]
+            if len(results) > 1:
+                analysis['company_reviews'] = results[1]
 
             # Add resume match if provided
             if resume_data:
@@ -306,26 +679,38 @@ class JobAnalyzer:
 
     def _scrape_salary_data(self, job_title: str) -> Dict[str, Any]:
         """Scrape real salary data from multiple sources"""
+        return asyncio.run(self._scrape_salary_data_async(job_title))
+
+    async def _scrape_salary_data_async(self, job_title: str) -> Dict[str, Any]:
+        """Scrape all salary sources concurrently"""
         try:
             # Format job title for URLs
-            formatted_title = job_title.lower().replace(' ', '-')
+            formatted_title = re.sub(r'[^a-z0-9-]', '', job_title.lower().replace(' ', '-'))
+
+            # One search page lists all three sites, so fetch it once
+            links = await asyncio.to_thread(self._search_salary_sites, job_title)
+            glassdoor, payscale, indeed = await asyncio.gather(
+                asyncio.to_thread(self._scrape_glassdoor_salary, links['glassdoor']),
+                asyncio.to_thread(self._scrape_payscale_salary, links['payscale']),
+                asyncio.to_thread(self._scrape_indeed_salary, links['indeed'])
+            )
             
             salary_data = {
                 'sources': [
                     {
                         'name': 'Glassdoor',
                         'url': f'https://www.glassdoor.com/Salaries/{formatted_title}-salary-SRCH_KO0,{len(job_title)}.htm',
-                        'data': self._scrape_glassdoor_salary(formatted_title)
+                        'data': glassdoor
                     },
                     {
                         'name': 'PayScale',
                         'url': f'https://www.payscale.com/research/US/Job={formatted_title}/Salary',
-                        'data': self._scrape_payscale_salary(formatted_title)
+                        'data': payscale
                     },
                     {
                         'name': 'Indeed',
                         'url': f'https://www.indeed.com/career/{formatted_title}/salaries',
-                        'data': self._scrape_indeed_salary(formatted_title)
+                        'data': indeed
                     }
                 ],
                 'average': None,
@@ -352,44 +737,55 @@ class JobAnalyzer:
                 'range': None
             }
 
-    def _scrape_glassdoor_salary(self, job_title: str) -> Dict[str, Any]:
-        """Get salary data from Glassdoor using SerpAPI or direct search"""
+    def _fetch(self, url: str, site: str) -> requests.Response:
+        """GET through the shared session, failing fast while the site's breaker is open"""
+        def get():
+            response = self._session.get(url, timeout=SCRAPE_TIMEOUT)
+            response.raise_for_status()
+            return response
+
+        return self._breakers[site].call(get)
+
+    def _search_salary_sites(self, job_title: str) -> Dict[str, str]:
+        """Find Glassdoor, Indeed and PayScale salary pages from a single Google search"""
+        links = {site: None for site in SALARY_SITE_PATTERNS}
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Use Google search to find Glassdoor salary page
-            search_query = f"{job_title} salary glassdoor"
-            search_url = f"https://www.google.com/search?q={search_query}"
-            
-            response = requests.get(search_url, headers=headers)
+            search_url = f"https://www.google.com/search?q={quote_plus(job_title + ' salary')}"
+            response = self._fetch(search_url, 'google')
             soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract first Glassdoor result
-            salary_data = {
-                'average': None,
-                'range': {'min': None, 'max': None},
-                'source_url': None
-            }
 
-            # Find Glassdoor link
-            glassdoor_link = soup.find('a', href=re.compile(r'glassdoor\.com.*salary'))
-            if glassdoor_link:
-                salary_data['source_url'] = glassdoor_link['href']
-                
-                # Visit Glassdoor page
-                glassdoor_response = requests.get(glassdoor_link['href'], headers=headers)
-                glassdoor_soup = BeautifulSoup(glassdoor_response.text, 'html.parser')
-                
-                # Extract salary information using common patterns
-                salary_text = glassdoor_soup.find(text=re.compile(r'\$[\d,]+\s*-\s*\$[\d,]+'))
-                if salary_text:
-                    salary_range = re.findall(r'\$[\d,]+', salary_text)
-                    if len(salary_range) >= 2:
-                        salary_data['range']['min'] = self._parse_salary(salary_range[0])
-                        salary_data['range']['max'] = self._parse_salary(salary_range[1])
-                        salary_data['average'] = (salary_data['range']['min'] + salary_data['range']['max']) / 2
+            for site, pattern in SALARY_SITE_PATTERNS.items():
+                link = soup.find('a', href=pattern)
+                if link:
+                    links[site] = link['href']
+
+        except Exception as e:
+            print(f"Salary search error: {str(e)}")
+
+        return links
+
+    def _scrape_glassdoor_salary(self, url: str) -> Dict[str, Any]:
+        """Get salary data from a Glassdoor salary page"""
+        salary_data = {
+            'average': None,
+            'range': {'min': None, 'max': None},
+            'source_url': url
+        }
+        if not url:
+            return salary_data
+
+        try:
+            response = self._fetch(url, 'glassdoor')
+            soup = BeautifulSoup(response.text, 'html.parser')
+            
+            # Extract salary information using common patterns
+            salary_text = soup.find(text=SALARY_RANGE_PATTERN)
+            if salary_text:
+                salary_range = SALARY_AMOUNT_PATTERN.findall(salary_text)
+                if len(salary_range) >= 2:
+                    salary_data['range']['min'] = self._parse_salary(salary_range[0])
+                    salary_data['range']['max'] = self._parse_salary(salary_range[1])
+                    salary_data['average'] = (salary_data['range']['min'] + salary_data['range']['max']) / 2
 
             return salary_data
 
@@ -397,40 +793,28 @@ class JobAnalyzer:
             print(f"Glassdoor salary scraping error: {str(e)}")
             return {'average': None, 'range': {'min': None, 'max': None}, 'source_url': None}
 
-    def _scrape_indeed_salary(self, job_title: str) -> Dict[str, Any]:
-        """Get salary data from Indeed using search"""
+    def _scrape_indeed_salary(self, url: str) -> Dict[str, Any]:
+        """Get salary data from an Indeed salary page"""
+        salary_data = {
+            'average': None,
+            'range': {'min': None, 'max': None},
+            'source_url': url
+        }
+        if not url:
+            return salary_data
+
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            search_query = f"{job_title} salary indeed"
-            search_url = f"https://www.google.com/search?q={search_query}"
-            
-            response = requests.get(search_url, headers=headers)
+            response = self._fetch(url, 'indeed')
             soup = BeautifulSoup(response.text, 'html.parser')
             
-            salary_data = {
-                'average': None,
-                'range': {'min': None, 'max': None},
-                'source_url': None
-            }
-
-            # Find Indeed link
-            indeed_link = soup.find('a', href=re.compile(r'indeed\.com.*salary'))
-            if indeed_link:
-                salary_data['source_url'] = indeed_link['href']
-                
-                indeed_response = requests.get(indeed_link['href'], headers=headers)
-                indeed_soup = BeautifulSoup(indeed_response.text, 'html.parser')
-                
-                salary_text = indeed_soup.find(text=re.compile(r'\$[\d,]+\s*-\s*\$[\d,]+'))
-                if salary_text:
-                    salary_range = re.findall(r'\$[\d,]+', salary_text)
-                    if len(salary_range) >= 2:
-                        salary_data['range']['min'] = self._parse_salary(salary_range[0])
-                        salary_data['range']['max'] = self._parse_salary(salary_range[1])
-                        salary_data['average'] = (salary_data['range']['min'] + salary_data['range']['max']) / 2
+            # Extract salary information using common patterns
+            salary_text = soup.find(text=SALARY_RANGE_PATTERN)
+            if salary_text:
+                salary_range = SALARY_AMOUNT_PATTERN.findall(salary_text)
+                if len(salary_range) >= 2:
+                    salary_data['range']['min'] = self._parse_salary(salary_range[0])
+                    salary_data['range']['max'] = self._parse_salary(salary_range[1])
+                    salary_data['average'] = (salary_data['range']['min'] + salary_data['range']['max']) / 2
 
             return salary_data
 
@@ -438,40 +822,28 @@ class JobAnalyzer:
             print(f"Indeed salary scraping error: {str(e)}")
             return {'average': None, 'range': {'min': None, 'max': None}, 'source_url': None}
 
-    def _scrape_payscale_salary(self, job_title: str) -> Dict[str, Any]:
-        """Get salary data from PayScale using search"""
+    def _scrape_payscale_salary(self, url: str) -> Dict[str, Any]:
+        """Get salary data from a PayScale salary page"""
+        salary_data = {
+            'average': None,
+            'range': {'min': None, 'max': None},
+            'source_url': url
+        }
+        if not url:
+            return salary_data
+
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            search_query = f"{job_title} salary payscale"
-            search_url = f"https://www.google.com/search?q={search_query}"
-            
-            response = requests.get(search_url, headers=headers)
+            response = self._fetch(url, 'payscale')
             soup = BeautifulSoup(response.text, 'html.parser')
             
-            salary_data = {
-                'average': None,
-                'range': {'min': None, 'max': None},
-                'source_url': None
-            }
-
-            # Find PayScale link
-            payscale_link = soup.find('a', href=re.compile(r'payscale\.com.*salary'))
-            if payscale_link:
-                salary_data['source_url'] = payscale_link['href']
-                
-                payscale_response = requests.get(payscale_link['href'], headers=headers)
-                payscale_soup = BeautifulSoup(payscale_response.text, 'html.parser')
-                
-                salary_text = payscale_soup.find(text=re.compile(r'\$[\d,]+\s*-\s*\$[\d,]+'))
-                if salary_text:
-                    salary_range = re.findall(r'\$[\d,]+', salary_text)
-                    if len(salary_range) >= 2:
-                        salary_data['range']['min'] = self._parse_salary(salary_range[0])
-                        salary_data['range']['max'] = self._parse_salary(salary_range[1])
-                        salary_data['average'] = (salary_data['range']['min'] + salary_data['range']['max']) / 2
+            # Extract salary information using common patterns
+            salary_text = soup.find(text=SALARY_RANGE_PATTERN)
+            if salary_text:
+                salary_range = SALARY_AMOUNT_PATTERN.findall(salary_text)
+                if len(salary_range) >= 2:
+                    salary_data['range']['min'] = self._parse_salary(salary_range[0])
+                    salary_data['range']['max'] = self._parse_salary(salary_range[1])
+                    salary_data['average'] = (salary_data['range']['min'] + salary_data['range']['max']) / 2
 
             return salary_data
 
@@ -490,13 +862,13 @@ class JobAnalyzer:
         """Analyze resume match with job requirements"""
         try:
             # Extract skills
-            resume_skills = set(skill.lower() for skill in resume_data.get('parsed_data', {}).get('skills', []))
-            required_skills = set()
-            
-            # Collect all required skills
-            for skill_type in ['technical', 'soft', 'tools']:
-                skills = job_analysis.get('required_skills', {}).get(skill_type, [])
-                required_skills.update(skill.lower() for skill in skills)
+            resume_skills = {skill.lower() for skill in resume_data.get('parsed_data', {}).get('skills', [])}
+            skill_groups = job_analysis.get('required_skills', {})
+            required_skills = {
+                skill.lower()
+                for skill_type in ('technical', 'soft', 'tools')
+                for skill in skill_groups.get(skill_type, [])
+            }
 
             # Calculate matches
             matching_skills = resume_skills.intersection(required_skills)
@@ -542,14 +914,14 @@ class JobAnalyzer:
 
             # Analyze past experience for cultural indicators
             for exp in resume_experience:
-                exp_text = f"{exp.get('description', '')} {exp.get('achievements', '')}"
-                if 'remote' in exp_text.lower():
+                exp_text = f"{exp.get('description', '')} {exp.get('achievements', '')}".lower()
+                if 'remote' in exp_text:
                     work_style_indicators['remote_work'] += 1
-                if any(word in exp_text.lower() for word in ['team', 'collaboration', 'group']):
+                if any(word in exp_text for word in ['team', 'collaboration', 'group']):
                     work_style_indicators['team_collaboration'] += 1
-                if any(word in exp_text.lower() for word in ['lead', 'manage', 'direct']):
+                if any(word in exp_text for word in ['lead', 'manage', 'direct']):
                     work_style_indicators['leadership'] += 1
-                if any(word in exp_text.lower() for word in ['communicate', 'present', 'report']):
+                if any(word in exp_text for word in ['communicate', 'present', 'report']):
                     work_style_indicators['communication'] += 1
 
             job_culture = job_analysis.get('company_culture', {})
@@ -678,167 +1050,42 @@ class JobAnalyzer:
         """Calculate comprehensive resume analytics using Gemini AI"""
         try:
             parsed_data = resume_data.get('parsed_data', {})
-            
-            # Prepare resume text for analysis
-            resume_text = json.dumps(parsed_data, indent=2)
-            
-            prompt = f"""
-            Analyze this resume comprehensively and provide detailed analytics:
-            
-            Resume Data: {resume_text}
-            
-            Return a JSON object with exact structure:
-            {{
-                "ats_score": {{
-                    "overall": 85,
-                    "breakdown": {{
-                        "format": 90,
-                        "keywords": 80,
-                        "experience": 85,
-                        "skills": 88,
-                        "education": 92
-                    }},
-                    "recommendations": ["Add more quantified achievements", "Include industry keywords"]
-                }},
-                "job_matches": [
-                    {{
-                        "role": "Software Engineer",
-                        "match_percentage": 85,
-                        "salary_range": "$75,000-$95,000",
-                        "market_demand": "High"
-                    }},
-                    {{
-                        "role": "Full Stack Developer", 
-                        "match_percentage": 80,
-                        "salary_range": "$70,000-$90,000",
-                        "market_demand": "High"
-                    }},
-                    {{
-                        "role": "Backend Developer",
-                        "match_percentage": 75,
-                        "salary_range": "$68,000-$88,000", 
-                        "market_demand": "Medium-High"
-                    }}
-                ],
-                "salary_analysis": {{
-                    "estimated_range": "$75,000-$95,000",
-                    "market_average": "$82,500",
-                    "experience_level": "Mid-level",
-                    "location_factor": "United States",
-                    "growth_potential": "15% annually"
-                }},
-                "skills_analysis": {{
-                    "technical_skills": {{
-                        "strengths": ["Python", "JavaScript", "React"],
-                        "in_demand": ["Cloud Computing", "DevOps", "Machine Learning"],
-                        "missing": ["Docker", "Kubernetes", "AWS"]
-                    }},
-                    "soft_skills": {{
-                        "identified": ["Leadership", "Communication", "Problem Solving"],
-                        "recommended": ["Project Management", "Team Collaboration"]
-                    }}
-                }},
-                "experience_analysis": {{
-                    "total_years": 3.5,
-                    "progression": "Good",
-                    "industry_relevance": "High",
-                    "achievements_quantified": 65,
-                    "recommendations": ["Add more metrics", "Highlight leadership roles"]
-                }},
-                "profile_completeness": {{
-                    "overall": 78,
-                    "sections": {{
-                        "personal_info": 95,
-                        "experience": 85,
-                        "skills": 80,
-                        "education": 90,
-                        "projects": 65,
-                        "certifications": 45
-                    }},
-                    "missing_sections": ["Certifications", "Awards"]
-                }},
-                "improvement_suggestions": [
-                    {{
-                        "priority": "High",
-                        "category": "ATS Optimization",
-                        "suggestion": "Add more industry-specific keywords",
-                        "impact": "Increase ATS score by 10-15%"
-                    }},
-                    {{
-                        "priority": "Medium", 
-                        "category": "Skills",
-                        "suggestion": "Add cloud computing certifications",
-                        "impact": "Better job matching for senior roles"
-                    }},
-                    {{
-                        "priority": "Low",
-                        "category": "Formatting",
-                        "suggestion": "Improve section organization",
-                        "impact": "Better readability"
-                    }}
-                ],
-                "market_insights": {{
-                    "industry_trends": [
-                        "Cloud computing skills in high demand",
-                        "Remote work experience valued",
-                        "Full-stack development trending"
-                    ],
-                    "salary_trends": "15% growth year-over-year",
-                    "job_availability": "High demand in tech sector"
-                }}
-            }}
-            
-            Analyze based on:
-            1. ATS compatibility (keywords, format, structure)
-            2. Market demand for skills
-            3. Experience progression and achievements
-            4. Salary potential based on skills and experience
-            5. Job role matches with realistic percentages
-            6. Specific improvement recommendations
-            7. Current market trends and insights
-            
-            Ensure all scores are realistic (0-100) and suggestions are actionable.
-            """
 
-            response = self.model.generate_content(
-                prompt,
-                generation_config={
-                    'temperature': 0.3,  # Lower temperature for consistent analysis
-                    'top_p': 0.8,
-                    'top_k': 20,
-                    'max_output_tokens': 4096
-                }
-            )
-
-            # Parse response
-            text = response.text.strip()
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("Invalid response format from AI")
-                
-            analytics = json.loads(text[start_idx:end_idx])
+            # Identical resumes produce identical analytics, so skip Gemini on a hash hit
+            resume_hash = self._resume_hash(parsed_data)
+            cached = self.analytics_cache.find_one({'hash': resume_hash})
+            if cached and cached.get('expires_at', 0) > int(time.time()):
+                logger.info("Using hash-cached analytics %s", resume_hash)
+                analytics = cached['analytics']
+            else:
+                analytics = self._generate_resume_analytics(parsed_data)
+                self.analytics_cache.replace_one(
+                    {'hash': resume_hash},
+                    {'hash': resume_hash, 'analytics': analytics, 'ts': datetime.now(timezone.utc),
+                     'expires_at': int(time.time()) + ANALYTICS_CACHE_TTL},
+                    upsert=True
+                )
             
             # Add timestamp and metadata
             analytics['generated_at'] = datetime.now().isoformat()
             analytics['version'] = '1.0'
             analytics['resume_id'] = str(resume_data.get('_id', ''))
             
-            # Store analytics in database
+            # Store analytics alongside (not inside) the resume document
             resume_id = resume_data.get('_id')
             if resume_id:
-                # Update resume document with analytics
-                self.resumes.update_one(
+                self.analytics_coll.replace_one(
                     {'_id': resume_id},
                     {
-                        '$set': {
-                            'analytics': analytics,
-                            'analytics_updated': datetime.now()
-                        }
-                    }
+                        '_id': resume_id,
+                        'user_id': resume_data.get('user_id'),
+                        'analytics': analytics,
+                        'analytics_updated': datetime.now(timezone.utc),
+                        'analytics_expires_at': int(time.time()) + RESUME_ANALYTICS_TTL
+                    },
+                    upsert=True
                 )
-                print(f"Analytics stored for resume {resume_id}")
+                logger.info("Analytics stored for resume %s", resume_id)
             
             return {
                 'success': True,
@@ -846,140 +1093,181 @@ class JobAnalyzer:
             }
 
         except json.JSONDecodeError as e:
-            print(f"JSON parsing error in analytics: {str(e)}")
+            logger.exception("JSON parsing error in analytics")
             return {
                 'success': False,
                 'error': 'Failed to parse AI response',
                 'analytics': self._get_default_analytics()
             }
+        except ValidationError as e:
+            logger.warning("Analytics validation error: %s", e)
+            return {
+                'success': False,
+                'error': 'AI response did not match the analytics structure',
+                'analytics': self._get_default_analytics()
+            }
         except Exception as e:
-            print(f"Resume analytics calculation error: {str(e)}")
+            logger.exception("Resume analytics calculation error")
             return {
                 'success': False,
                 'error': str(e),
                 'analytics': self._get_default_analytics()
             }
 
+    def _resume_hash(self, parsed_data: Dict[str, Any]) -> str:
+        """Stable content hash of parsed resume data"""
+        canonical = orjson.dumps(parsed_data, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+    def _generate_resume_analytics(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the Gemini analytics prompt for parsed resume data"""
+        # Prepare resume text for analysis
+        resume_text = json.dumps(parsed_data, indent=2)
+        
+        prompt = _ANALYTICS_PROMPT_HEAD + resume_text + _ANALYTICS_PROMPT_TAIL
+
+        with self._gemini_slots:
+            response = self.model.generate_content(prompt, generation_config=self._analytics_gen_cfg, stream=True)
+            text = self._read_json_stream(response)
+        logger.debug("Analytics response length: %d chars", len(text))
+
+        return ResumeAnalytics.model_validate(self._parse_analytics_response(text)).model_dump()
+
+    def _parse_analytics_response(self, text: str) -> Dict[str, Any]:
+        """Decode a JSON-mode Gemini analytics response"""
+        return orjson.loads(text)
+
+    def _read_json_stream(self, response) -> str:
+        """Collect a streamed JSON-mode response, stopping as soon as the top-level object closes"""
+        parts = []
+        depth = 0
+        in_string = False
+        escaped = False
+        for chunk in response:
+            text = chunk.text if chunk.parts else ''
+            for i, ch in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == '\\':
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch == '{':
+                    depth += 1
+                elif ch == '}':
+                    depth -= 1
+                    if depth == 0:
+                        # Anything after this is padding the model may keep emitting
+                        parts.append(text[:i + 1])
+                        return ''.join(parts)
+            parts.append(text)
+        return ''.join(parts)
+
     def _get_default_analytics(self) -> Dict[str, Any]:
-        """Return default analytics structure when calculation fails"""
-        return {
-            "ats_score": {
-                "overall": 70,
-                "breakdown": {
-                    "format": 80,
-                    "keywords": 60,
-                    "experience": 70,
-                    "skills": 75,
-                    "education": 85
-                },
-                "recommendations": ["Add more quantified achievements", "Include industry keywords"]
-            },
-            "job_matches": [
-                {
-                    "role": "Software Engineer",
-                    "match_percentage": 75,
-                    "salary_range": "$70,000-$90,000",
-                    "market_demand": "High"
-                },
-                {
-                    "role": "Developer",
-                    "match_percentage": 70,
-                    "salary_range": "$65,000-$85,000",
-                    "market_demand": "Medium-High"
-                }
-            ],
-            "salary_analysis": {
-                "estimated_range": "$70,000-$90,000",
-                "market_average": "$80,000",
-                "experience_level": "Mid-level",
-                "location_factor": "United States",
-                "growth_potential": "10% annually"
-            },
-            "skills_analysis": {
-                "technical_skills": {
-                    "strengths": [],
-                    "in_demand": ["Cloud Computing", "Machine Learning"],
-                    "missing": ["Advanced frameworks"]
-                },
-                "soft_skills": {
-                    "identified": ["Communication"],
-                    "recommended": ["Leadership", "Project Management"]
-                }
-            },
-            "experience_analysis": {
-                "total_years": 2,
-                "progression": "Good",
-                "industry_relevance": "Medium",
-                "achievements_quantified": 50,
-                "recommendations": ["Add more metrics", "Highlight achievements"]
-            },
-            "profile_completeness": {
-                "overall": 70,
-                "sections": {
-                    "personal_info": 90,
-                    "experience": 70,
-                    "skills": 75,
-                    "education": 80,
-                    "projects": 60,
-                    "certifications": 30
-                },
-                "missing_sections": ["Certifications", "Projects"]
-            },
-            "improvement_suggestions": [
-                {
-                    "priority": "High",
-                    "category": "Content",
-                    "suggestion": "Add more quantified achievements",
-                    "impact": "Improve ATS score"
-                }
-            ],
-            "market_insights": {
-                "industry_trends": ["Technology skills in demand"],
-                "salary_trends": "Stable growth",
-                "job_availability": "Good opportunities available"
-            },
-            "generated_at": datetime.now().isoformat(),
-            "version": "1.0"
-        }
+        """Return default analytics structure when calculation fails; each call gets its own copy"""
+        analytics = orjson.loads(_DEFAULT_ANALYTICS_BYTES)
+        analytics['generated_at'] = datetime.now().isoformat()
+        return analytics
 
     def get_resume_analytics(self, resume_id: str) -> Dict[str, Any]:
         """Get analytics for a specific resume, calculate if not exists"""
         try:
             from bson import ObjectId
-            
-            # Get resume data
-            resume = self.resumes.find_one({'_id': ObjectId(resume_id)})
-            if not resume:
+
+            with self._analytics_lru_lock:
+                entry = self._analytics_lru.get(resume_id)
+            if entry is not None:
                 return {
-                    'success': False,
-                    'error': 'Resume not found'
+                    'success': True,
+                    'analytics': copy.deepcopy(entry[0]),
+                    'cached': True
                 }
             
             # Check if analytics already exist and are recent (less than 24 hours old)
-            if 'analytics' in resume and 'analytics_updated' in resume:
-                last_updated = resume['analytics_updated']
-                if isinstance(last_updated, datetime):
-                    if (datetime.now() - last_updated).total_seconds() < 86400:  # 24 hours
-                        print(f"Using cached analytics for resume {resume_id}")
-                        return {
-                            'success': True,
-                            'analytics': resume['analytics'],
-                            'cached': True
-                        }
-            
-            # Calculate new analytics
-            print(f"Calculating new analytics for resume {resume_id}")
-            result = self.calculate_resume_analytics(resume)
+            resume_oid = ObjectId(resume_id)
+            stored = self.analytics_coll.find_one({'_id': resume_oid})
+            if stored and 'analytics' in stored:
+                expires_at = stored.get('analytics_expires_at', 0)
+                if expires_at > int(time.time()):
+                    logger.debug("Using cached analytics for resume %s", resume_id)
+                    self._remember_analytics(resume_id, stored['analytics'], expires_at)
+                    return {
+                        'success': True,
+                        'analytics': stored['analytics'],
+                        'cached': True
+                    }
             
-            if result['success']:
-                result['cached'] = False
+            # Stale or missing: one caller per resume recalculates, the rest wait for it
+            with self._inflight_lock:
+                event = self._inflight.get(resume_id)
+                is_leader = event is None
+                if is_leader:
+                    event = self._inflight[resume_id] = threading.Event()
+
+            if not is_leader:
+                event.wait(ANALYTICS_INFLIGHT_TIMEOUT)
+                with self._analytics_lru_lock:
+                    entry = self._analytics_lru.get(resume_id)
+                if entry is not None:
+                    return {
+                        'success': True,
+                        'analytics': copy.deepcopy(entry[0]),
+                        'cached': True
+                    }
+                # The other calculation failed or timed out, so try ourselves
+
+            try:
+                logger.info("Calculating new analytics for resume %s", resume_id)
+                resume = self.resumes.find_one({'_id': resume_oid})
+                if not resume:
+                    return {
+                        'success': False,
+                        'error': 'Resume not found'
+                    }
+                result = self.calculate_resume_analytics(resume)
                 
-            return result
+                if result['success']:
+                    result['cached'] = False
+                    self._remember_analytics(resume_id, result['analytics'], int(time.time()) + RESUME_ANALYTICS_TTL)
+                    
+                return result
+            finally:
+                if is_leader:
+                    with self._inflight_lock:
+                        self._inflight.pop(resume_id, None)
+                    event.set()
             
         except Exception as e:
-            print(f"Error getting resume analytics: {str(e)}")
+            logger.exception("Error getting resume analytics")
             return {
                 'success': False,
                 'error': str(e),
                 'analytics': self._get_default_analytics()
-            }
\ No newline at end of file
+            }
+
+    def _remember_analytics(self, resume_id: str, analytics: Dict[str, Any], expires_at: int):
+        """Keep a private copy of analytics in the in-process cache until they go stale.
+
+        Hits hand out copies too, so no caller can mutate the cached entry.
+        """
+        analytics = copy.deepcopy(analytics)
+        self._intern_analytics(analytics)
+        with self._analytics_lru_lock:
+            self._analytics_lru[resume_id] = (analytics, expires_at)
+
+    def _intern_analytics(self, analytics: Dict[str, Any]):
+        """Intern low-cardinality labels so cached analytics share one copy of each"""
+        for suggestion in analytics.get('improvement_suggestions', []):
+            for key in ('priority', 'category'):
+                if isinstance(suggestion.get(key), str):
+                    suggestion[key] = sys.intern(suggestion[key])
+        for match in analytics.get('job_matches', []):
+            if isinstance(match.get('market_demand'), str):
+                match['market_demand'] = sys.intern(match['market_demand'])
+        experience = analytics.get('experience_analysis', {})
+        for key in ('progression', 'industry_relevance'):
+            if isinstance(experience.get(key), str):
+                experience[key] = sys.intern(experience[key])
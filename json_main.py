@@ -1,18 +1,29 @@
-from flask import Flask, request, jsonify, Blueprint, send_file
+from flask import Flask, Response, request, Blueprint, send_file
 import os
+import shutil
 import logging
-import json
-import io
+import re
+import asyncio
+import copy
+import hashlib
+import threading
+import time
+import uuid
+import orjson
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 from cover_letter_generator import CoverLetterGenerator
 from cold_email_generator import ColdEmailGenerator
 from resume_generator import ResumeGenerator
 from resume_parser import ResumeParser
+from parse_worker import parse_resume_in_pool
 from job_analyzer import JobAnalyzer
-from bson import ObjectId
-from typing import List, Dict
+from pymongo import MongoClient
+from typing import List, Dict, Optional
 from interview_preparation import InterviewPreparation
 from flask_cors import CORS
+from flask_compress import Compress
 
 # Configure logging
 logging.basicConfig(
@@ -22,8 +33,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Constants
-UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx'}
+UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'doc', 'docx'})
+_JSON_RE = re.compile(rb'\{.*\}', re.DOTALL)  # Outermost JSON object in a model reply
+# First number in a duration string; measured faster than a str.translate digit filter on short inputs
+_DIGITS_RE = re.compile(r'\d+')
+UPLOAD_COPY_BUFFER = 1024 * 1024  # 1 MB chunks when writing uploads to disk
+
+# Parsed job analyses keyed by prompt digest; values are orjson bytes so every hit is a fresh copy
+_job_analysis_cache = LRUCache(maxsize=1024)
+_job_analysis_cache_lock = threading.Lock()
+
+# Recently fetched resumes by id, so one session's page hits share a MongoDB read
+_resume_cache = TTLCache(maxsize=512, ttl=60)
+_resume_cache_lock = threading.Lock()
+
+# Study plans by resume version as (plan, generated_at); older than the soft TTL they are
+# still served while one background refresh regenerates them
+STUDY_PLAN_SOFT_TTL = 60 * 60
+_study_plans = TTLCache(maxsize=512, ttl=24 * 60 * 60)
+_study_plans_lock = threading.Lock()
+_study_plans_refreshing = set()
+_study_plan_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='study-plan-refresh')
 
 def is_api_request():
     """Check if request is asking for JSON response"""
@@ -36,42 +67,155 @@ def is_api_request():
 
 def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
-    return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
+    name, dot, ext = filename.rpartition('.')
+    return bool(dot) and bool(name) and ext.lower() in ALLOWED_EXTENSIONS
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """Build a JSON response with orjson; ObjectIds and other unknown types become strings"""
+    return Response(
+        orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def _resumes_etag(resumes: List[Dict]) -> str:
+    """Version tag for a list of resumes, from each resume's id and last update time"""
+    digest = hashlib.blake2b(digest_size=16)
+    for resume in resumes:
+        # updated_at is written by every save; last_updated only at upload
+        stamp = resume.get('updated_at') or resume.get('last_updated') or resume.get('upload_date')
+        if hasattr(stamp, 'timestamp'):
+            stamp = stamp.timestamp()
+        digest.update(f"{resume.get('_id')}:{stamp};".encode())
+    return digest.hexdigest()
+
+def _get_resume_cached(resume_id: str) -> Optional[Dict]:
+    """Fetch a resume through the short-lived cache; each caller gets its own copy"""
+    with _resume_cache_lock:
+        resume = _resume_cache.get(resume_id)
+    if resume is None:
+        resume = app.config['resume_parser'].get_resume_by_id_sync(resume_id, ResumeParser.PAGE_PROJECTION)
+        if resume is None:
+            return None
+        with _resume_cache_lock:
+            _resume_cache[resume_id] = resume
+    return copy.deepcopy(resume)
+
+def _store_study_plan(key, resume_data: Dict) -> Dict:
+    """Generate a study plan and remember when it was made"""
+    plan = app.config['interview_prep']._generate_study_plan(resume_data)
+    with _study_plans_lock:
+        _study_plans[key] = (plan, time.time())
+    return plan
+
+def _refresh_study_plan(key, resume_data: Dict) -> None:
+    """Regenerate a stale study plan off the request thread"""
+    try:
+        _store_study_plan(key, resume_data)
+    except Exception as e:
+        logger.warning(f"Study plan refresh failed for {key[0]}: {e}")
+    finally:
+        with _study_plans_lock:
+            _study_plans_refreshing.discard(key)
+
+def _get_study_plan(resume_id: str, resume_data: Dict) -> Dict:
+    """Return the cached study plan immediately, refreshing it in the background when stale"""
+    key = (resume_id, str(resume_data.get('updated_at') or resume_data.get('last_updated')))
+    with _study_plans_lock:
+        cached = _study_plans.get(key)
+        refresh = (cached is not None and time.time() - cached[1] > STUDY_PLAN_SOFT_TTL
+                   and key not in _study_plans_refreshing)
+        if refresh:
+            _study_plans_refreshing.add(key)
+    if cached is None:
+        return _store_study_plan(key, resume_data)
+    if refresh:
+        _study_plan_refresh_pool.submit(_refresh_study_plan, key, resume_data)
+    return cached[0]
+
+def _invalidate_resume_cache(resume_id) -> None:
+    """Drop a resume from the cache after it is written"""
+    with _resume_cache_lock:
+        _resume_cache.pop(str(resume_id), None)
+
+def _not_modified(etag: str):
+    """Return a 304 response if the client already has this version, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+def _with_etag(response: Response, etag: str) -> Response:
+    """Tag a response so the next poll can be answered with a 304"""
+    response.set_etag(etag, weak=True)
+    return response
 
 def create_app():
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev')
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+    app.json.compact = True  # For any remaining flask.json users
+    # Resume and analysis JSON compresses well; skip tiny bodies not worth the CPU
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_LEVEL'] = 4
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    app.config['COMPRESS_MIN_SIZE'] = 1024
     CORS(app, origins=["*"])
+    Compress(app)
     
     # Ensure upload directory exists
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
     
+    # Parse workers spawned while this file runs as a script re-import it as __mp_main__;
+    # they only run parse_worker, so don't build the components and Mongo client there
+    if __name__ == '__mp_main__':
+        return app
+    
+    # One pooled MongoDB client shared by every component instead of one client each
+    mongo_client = MongoClient("mongodb://127.0.0.1:27017", maxPoolSize=50, compressors="zstd,zlib")
+    app.config['mongo_client'] = mongo_client
+
     # Initialize components without ChromaDB
-    app.config['resume_parser'] = ResumeParser()
-    app.config['resume_gen'] = ResumeGenerator()
-    app.config['cover_letter_gen'] = CoverLetterGenerator()
-    app.config['email_gen'] = ColdEmailGenerator()
-    app.config['job_analyzer'] = JobAnalyzer()
-    app.config['interview_prep'] = InterviewPreparation()
+    app.config['resume_parser'] = ResumeParser(mongo_client=mongo_client)
+    app.config['resume_gen'] = ResumeGenerator(mongo_client=mongo_client)
+    app.config['cover_letter_gen'] = CoverLetterGenerator(mongo_client=mongo_client)
+    app.config['email_gen'] = ColdEmailGenerator(mongo_client=mongo_client)
+    app.config['job_analyzer'] = JobAnalyzer(mongo_client=mongo_client)
+    app.config['interview_prep'] = InterviewPreparation(
+        mongo_client=mongo_client,
+        http_session=app.config['job_analyzer'].http_session
+    )
     
     return app
 
+def _lowered_skills(skills) -> frozenset:
+    """Lowercase a skills list, or the category lists of a parsed skills dict, into one set"""
+    if isinstance(skills, dict):
+        return frozenset(
+            skill.lower()
+            for category in skills.values() if isinstance(category, list)
+            for skill in category if isinstance(skill, str)
+        )
+    return frozenset(skill.lower() for skill in skills if isinstance(skill, str))
+
 def _analyze_resume_match(self, job_analysis: Dict, resume_data: Dict) -> Dict:
     """Analyze how well the resume matches the job requirements"""
     try:
-        resume_skills = set(skill.lower() for skill in resume_data['parsed_data'].get('skills', []))
-        required_skills = set(skill.lower() for skill in job_analysis.get('required_skills', []))
+        resume_skills = _lowered_skills(resume_data['parsed_data'].get('skills', []))
+        required_skills = _lowered_skills(job_analysis.get('required_skills', []))
 
         # Calculate match percentages
-        skill_matches = resume_skills.intersection(required_skills)
+        skill_matches = resume_skills & required_skills
+        missing_skills = list(required_skills - resume_skills)
         skill_match_percentage = len(skill_matches) / len(required_skills) * 100 if required_skills else 0
 
         return {
             'overall_match_percentage': round(skill_match_percentage, 2),
             'matching_skills': list(skill_matches),
-            'missing_skills': list(required_skills - resume_skills),
+            'missing_skills': missing_skills,
             'additional_skills': list(resume_skills - required_skills),
             'experience_match': self._check_experience_match(
                 job_analysis.get('experience_needed', ''),
@@ -79,7 +223,7 @@ def _analyze_resume_match(self, job_analysis: Dict, resume_data: Dict) -> Dict:
             ),
             'recommendations': self._generate_match_recommendations(
                 skill_match_percentage,
-                list(required_skills - resume_skills)
+                missing_skills
             )
         }
 
@@ -91,11 +235,12 @@ def _check_experience_match(self, required_experience: str, resume_experience: L
     """Check if resume experience matches job requirements"""
     try:
         # Extract years from requirement (e.g., "3+ years" -> 3)
-        required_years = int(''.join(filter(str.isdigit, required_experience))) if required_experience else 0
+        match = _DIGITS_RE.search(required_experience) if required_experience else None
+        required_years = int(match.group()) if match else 0
         
         # Calculate total experience from resume
-        total_years = sum(self._calculate_experience_duration(exp.get('duration', ''))
-                         for exp in resume_experience)
+        total_years = sum([self._calculate_experience_duration(exp.get('duration') or '')
+                           for exp in resume_experience])
 
         return {
             'has_sufficient_experience': total_years >= required_years,
@@ -113,11 +258,12 @@ def _calculate_experience_duration(self, duration_str: str) -> float:
     try:
         # Handle common duration formats
         duration_str = duration_str.lower()
+        match = _DIGITS_RE.search(duration_str)
+        amount = int(match.group()) if match else 0
         if 'year' in duration_str:
-            return float(''.join(filter(str.isdigit, duration_str)))
+            return float(amount)
         elif 'month' in duration_str:
-            months = float(''.join(filter(str.isdigit, duration_str)))
-            return round(months / 12, 1)
+            return round(amount / 12, 1)
         return 0
     except:
         return 0
@@ -156,20 +302,30 @@ def analyze_job_description(self, job_description: str, resume_data: Dict = None
         Format as JSON with clear sections.
         """
 
-        # Get analysis from Gemini
-        response = self.model.generate_content(
-            prompt,
-            generation_config={
-                'temperature': 0.3,
-                'top_p': 1,
-                'top_k': 32
-            }
-        )
+        prompt_key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        with _job_analysis_cache_lock:
+            cached = _job_analysis_cache.get(prompt_key)
+
+        if cached is not None:
+            analysis = orjson.loads(cached)
+        else:
+            # Get analysis from Gemini
+            response = self.model.generate_content(
+                prompt,
+                generation_config={
+                    'temperature': 0.3,
+                    'top_p': 1,
+                    'top_k': 32
+                }
+            )
 
-        # Parse the response
-        start_idx = response.text.find('{')
-        end_idx = response.text.rfind('}') + 1
-        analysis = json.loads(response.text[start_idx:end_idx])
+            # Parse the response
+            match = _JSON_RE.search(response.text.encode())
+            if not match:
+                raise ValueError("No JSON object in model response")
+            analysis = orjson.loads(match.group(0))
+            with _job_analysis_cache_lock:
+                _job_analysis_cache[prompt_key] = match.group(0)
 
         # If resume data is provided, add match analysis
         if resume_data:
@@ -192,14 +348,16 @@ def analyze_job_description(self, job_description: str, resume_data: Dict = None
 
 app = create_app()
 
+_HEALTH_BODY = orjson.dumps({
+    'success': True,
+    'status': 'healthy',
+    'message': 'Resume AI API is running'
+})
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for deployment"""
-    return jsonify({
-        'success': True,
-        'status': 'healthy',
-        'message': 'Resume AI API is running'
-    })
+    return Response(_HEALTH_BODY, mimetype='application/json')
 
 # Routes
 @app.route('/')
@@ -209,27 +367,29 @@ def index():
         if 'resume_parser' not in app.config:
             error_msg = "Application not properly initialized"
             logging.error("Resume parser not initialized")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': error_msg
             }), 500
             
         resumes = app.config['resume_parser'].get_recent_resumes_sync(limit=3)
+        etag = _resumes_etag(resumes)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
         
-        # Serialize ObjectIds to strings
-        serialized_resumes = serialize_resume_data(resumes)
-        
-        return jsonify({
+        # ojsonify turns ObjectIds into strings while encoding, no pre-walk needed
+        return _with_etag(ojsonify({
             'success': True,
-            'resumes': serialized_resumes,
-            'count': len(serialized_resumes)
-        })
+            'resumes': resumes,
+            'count': len(resumes)
+        }), etag)
         
     except Exception as e:
         error_msg = f"Unable to load resumes: {str(e)}"
         logging.error(f"Index error: {str(e)}")
         
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': error_msg
         }), 500
@@ -241,30 +401,74 @@ def get_recent_resumes():
     try:
         limit = request.args.get('limit', 3, type=int)
         resumes = app.config['resume_parser'].get_recent_resumes_sync(limit=limit)
+        etag = _resumes_etag(resumes)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
         
-        # Serialize ObjectIds to strings
-        serialized_resumes = serialize_resume_data(resumes)
-        
-        return jsonify({
+        # ojsonify turns ObjectIds into strings while encoding, no pre-walk needed
+        return _with_etag(ojsonify({
             'success': True,
-            'resumes': serialized_resumes,
-            'count': len(serialized_resumes)
-        })
+            'resumes': resumes,
+            'count': len(resumes)
+        }), etag)
         
     except Exception as e:
         logging.error(f"Recent resumes error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+# Skills shape for resumes stored before skills were categorised; only ever copied, never mutated
+_DEFAULT_SKILLS = {
+    'technical_skills': (),
+    'programming_languages': (),
+    'frameworks': (),
+    'tools': (),
+    'soft_skills': ()
+}
+
+def _normalize_resume(resume: Dict) -> Dict:
+    """Fill in fields the resume list expects but older documents may lack"""
+    parsed_data = resume.get('parsed_data')
+    parsed_data = dict(parsed_data) if isinstance(parsed_data, dict) else {}
+
+    personal_info = dict(parsed_data.get('personal_info') or {})
+    personal_info.setdefault('name', resume.get('original_filename', 'Unknown'))
+    parsed_data['personal_info'] = personal_info
+
+    # Convert old list format to new dict format if needed
+    skills = parsed_data.get('skills', {})
+    if isinstance(skills, list):
+        skills = {**_DEFAULT_SKILLS, 'technical_skills': skills[:5]}
+    elif not isinstance(skills, dict):
+        skills = dict(_DEFAULT_SKILLS)
+    parsed_data['skills'] = skills
+
+    normalized = dict(resume)
+    normalized['parsed_data'] = parsed_data
+    normalized.setdefault('upload_date', 'Unknown')
+    normalized.setdefault('file_size', 0)
+    normalized.setdefault('processing_status', 'completed')
+    return normalized
+
+def _iter_resumes_json(resumes: List[Dict]):
+    """Stream the resume list as JSON, fixing up each resume as it is encoded"""
+    yield b'{"success":true,"resumes":['
+    for i, resume in enumerate(map(_normalize_resume, resumes)):
+        if i:
+            yield b','
+        yield orjson.dumps(resume, default=str, option=orjson.OPT_NON_STR_KEYS)
+    yield b']}'
+
 @app.route('/my-resumes')
 def my_resumes():
     """Show all resumes with proper error handling"""
     try:
         if 'resume_parser' not in app.config:
             logging.error("Resume parser not initialized")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': "Application not properly initialized"
             }), 500
@@ -280,71 +484,33 @@ def my_resumes():
         
         if not resumes:
             logging.warning("No resumes found in database")
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'resumes': [],
                 'message': "No resumes found"
             })
         
-        # Ensure each resume has required fields for template
-        for resume in resumes:
-            # Add default values if missing
-            if 'parsed_data' not in resume:
-                resume['parsed_data'] = {}
-            if 'personal_info' not in resume.get('parsed_data', {}):
-                resume['parsed_data']['personal_info'] = {}
-            if 'name' not in resume['parsed_data']['personal_info']:
-                resume['parsed_data']['personal_info']['name'] = resume.get('original_filename', 'Unknown')
-            
-            # Handle skills structure - ensure it's properly formatted
-            if 'skills' not in resume['parsed_data']:
-                resume['parsed_data']['skills'] = {}
-            
-            # Convert old list format to new dict format if needed
-            skills = resume['parsed_data']['skills']
-            if isinstance(skills, list):
-                resume['parsed_data']['skills'] = {
-                    'technical_skills': skills[:5] if skills else [],
-                    'programming_languages': [],
-                    'frameworks': [],
-                    'tools': [],
-                    'soft_skills': []
-                }
-            elif not isinstance(skills, dict):
-                resume['parsed_data']['skills'] = {
-                    'technical_skills': [],
-                    'programming_languages': [],
-                    'frameworks': [],
-                    'tools': [],
-                    'soft_skills': []
-                }
-            
-            # Ensure upload_date exists
-            if 'upload_date' not in resume:
-                resume['upload_date'] = 'Unknown'
-            
-            # Add any other missing fields your template expects
-            resume.setdefault('file_size', 0)
-            resume.setdefault('processing_status', 'completed')
-            
-        return jsonify({
-            'success': True,
-            'resumes': resumes
-        })
+        etag = _resumes_etag(resumes)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        # Stream the list instead of building the whole payload in memory
+        return _with_etag(Response(_iter_resumes_json(resumes), mimetype='application/json'), etag)
         
     except Exception as e:
         logging.error(f"My resumes error: {str(e)}")
         logging.error(f"Error type: {type(e)}")
         import traceback
         logging.error(f"Traceback: {traceback.format_exc()}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': "Unable to fetch resumes"
         }), 500
 
 @app.route('/resume')
 def resume_page():
-    return jsonify({
+    return ojsonify({
         'success': True,
         'page': 'resume',
         'message': 'Resume page endpoint'
@@ -352,7 +518,7 @@ def resume_page():
 
 @app.route('/cover-letter')
 def cover_letter_page():
-    return jsonify({
+    return ojsonify({
         'success': True,
         'page': 'cover_letter',
         'message': 'Cover letter page endpoint'
@@ -360,7 +526,7 @@ def cover_letter_page():
 
 @app.route('/email')
 def email_page():
-    return jsonify({
+    return ojsonify({
         'success': True,
         'page': 'email',
         'message': 'Email page endpoint'
@@ -371,10 +537,10 @@ def dashboard(resume_id):
     """Dashboard for a specific resume"""
     try:
         # Get resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.warning(f"No resume found with ID: {resume_id}")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Resume not found'
             }), 404
@@ -382,14 +548,14 @@ def dashboard(resume_id):
         # Get interview statistics
         interview_stats = app.config['interview_prep'].get_interview_statistics(resume_id)
             
-        return jsonify({
+        return ojsonify({
             'success': True,
             'resume_data': resume_data,
             'interview_stats': interview_stats
         })
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -399,43 +565,47 @@ def download_resume(resume_id):
     """Download original PDF file from GridFS."""
     try:
         # Get resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
-            return jsonify({'success': False, 'error': 'Resume not found'}), 404
+            return ojsonify({'success': False, 'error': 'Resume not found'}), 404
         
         # Check if file_id exists
         if 'file_id' not in resume_data:
-            return jsonify({'success': False, 'error': 'Original file not found'}), 404
+            return ojsonify({'success': False, 'error': 'Original file not found'}), 404
         
-        # Get original file from GridFS
-        file_data = app.config['resume_parser'].get_resume_file(resume_data['file_id'])
-        if not file_data:
-            return jsonify({'success': False, 'error': 'File data not found'}), 404
+        # Open original file from GridFS; GridOut is file-like, so it is streamed in chunks
+        grid_out = app.config['resume_parser'].open_resume_file(resume_data['file_id'])
+        if not grid_out:
+            return ojsonify({'success': False, 'error': 'File data not found'}), 404
         
-        # Get file metadata
-        file_metadata = app.config['resume_parser'].get_file_metadata(resume_data['file_id'])
-        filename = file_metadata.get('filename', f"resume_{resume_id}.pdf") if file_metadata else f"resume_{resume_id}.pdf"
+        filename = grid_out.filename or f"resume_{resume_id}.pdf"
         
-        return send_file(
-            io.BytesIO(file_data),
+        response = send_file(
+            grid_out,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            last_modified=grid_out.upload_date,
+            conditional=True
         )
+        # send_file can't size a file object; only a full 200 body has the file's length
+        if response.status_code == 200:
+            response.content_length = grid_out.length
+        return response
         
     except Exception as e:
         logger.error(f"Resume download error: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/cover-letter/<resume_id>', methods=['GET', 'POST'])
 def generate_cover_letter(resume_id):
     """Generate cover letter using existing resume data"""
     try:
         # Get existing resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': "Resume not found"
             }), 404
@@ -450,10 +620,10 @@ def generate_cover_letter(resume_id):
                 job_description=data.get('job_description'),
                 additional_context=data.get('additional_context', '')
             )
-            return jsonify(result)
+            return ojsonify(result)
 
         # GET request - return form data
-        return jsonify({
+        return ojsonify({
             'success': True,
             'resume_data': resume_data,
             'resume_id': resume_id,
@@ -462,7 +632,7 @@ def generate_cover_letter(resume_id):
                              
     except Exception as e:
         logger.error(f"Cover letter generation error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -480,14 +650,14 @@ async def generate_cover_letter():
     
     if not result['success']:
         if result.get('needs_more_info'):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'needs_more_info': True,
                 'follow_up_questions': result['follow_up_questions']
             }), 422
-        return jsonify(result), 400
+        return ojsonify(result), 400
     
-    return jsonify(result)
+    return ojsonify(result)
 
 @cover_letter_bp.route('/regenerate', methods=['POST'])
 async def regenerate_cover_letter():
@@ -495,20 +665,20 @@ async def regenerate_cover_letter():
     feedback = data.pop('feedback', '')
     
     if not feedback:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Feedback is required for regeneration'
         }), 400
     
     result = await app.config['cover_letter_gen'].regenerate_with_feedback(data, feedback)
-    return jsonify(result)
+    return ojsonify(result)
 
 @cover_letter_bp.route('/generate-with-analysis', methods=['POST'])
 async def generate_cover_letter_with_analysis():
     data = request.json
     
     if not all([data.get('job_description'), data.get('resume_id')]):
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Job description and resume ID are required'
         }), 400
@@ -519,20 +689,20 @@ async def generate_cover_letter_with_analysis():
         data['resume_id']
     )
     
-    return jsonify(result)
+    return ojsonify(result)
 
 # Email Routes
 @email_bp.route('/generate', methods=['POST'])
 async def generate_email():
     data = request.json
     result = await app.config['email_gen'].generate_email(data)
-    return jsonify(result)
+    return ojsonify(result)
 
 @email_bp.route('/generate-with-resume', methods=['POST'])
 async def generate_email_with_resume():
     data = request.json
     if not all([data.get('resume_id'), data.get('role_context')]):
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Resume ID and role context are required'
         }), 400
@@ -541,7 +711,7 @@ async def generate_email_with_resume():
         data,
         data['resume_id']
     )
-    return jsonify(result)
+    return ojsonify(result)
 
 @email_bp.route('/regenerate', methods=['POST'])
 async def regenerate_email():
@@ -549,19 +719,19 @@ async def regenerate_email():
     feedback = data.pop('feedback', '')
     
     if not feedback:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Feedback is required for regeneration'
         }), 400
     
     result = await app.config['email_gen'].regenerate_email(data, feedback)
-    return jsonify(result)
+    return ojsonify(result)
 
 @email_bp.route('/research-recipient', methods=['POST'])
 async def research_recipient():
     data = request.json
     result = await app.config['email_gen'].research_recipient(data)
-    return jsonify(result)
+    return ojsonify(result)
 
 # Resume Routes
 @resume_bp.route('/generate', methods=['POST'])
@@ -571,21 +741,21 @@ async def generate_resume():
     result = await app.config['resume_gen'].generate_resume(data, job_description)
     
     if not result['success']:
-        return jsonify(result), 400
+        return ojsonify(result), 400
     
-    return jsonify(result)
+    return ojsonify(result)
 
 @resume_bp.route('/optimize', methods=['POST'])
 async def optimize_content():
     data = request.json
     if not data.get('content') or not data.get('industry'):
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Content and industry are required'
         }), 400
     
     result = await app.config['resume_gen'].optimize_content(data['content'], data['industry'])
-    return jsonify({'success': True, 'optimization': result})
+    return ojsonify({'success': True, 'optimization': result})
 
 @resume_bp.route('/regenerate', methods=['POST'])
 async def regenerate_resume():
@@ -593,13 +763,13 @@ async def regenerate_resume():
     feedback = data.pop('feedback', '')
     
     if not feedback:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': 'Feedback is required for regeneration'
         }), 400
     
     result = await app.config['resume_gen'].regenerate_with_feedback(data, feedback)
-    return jsonify(result)
+    return ojsonify(result)
 
 @app.route('/api/resume/analyze-job', methods=['POST'])
 def analyze_job():
@@ -607,7 +777,7 @@ def analyze_job():
     try:
         data = request.json
         if not data or not data.get('job_description'):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Job description is required'
             }), 400
@@ -615,9 +785,9 @@ def analyze_job():
         # Get resume data if resume_id provided
         resume_data = None
         if data.get('resume_id'):
-            resume_data = app.config['resume_parser'].get_resume_by_id_sync(data['resume_id'])
+            resume_data = _get_resume_cached(data['resume_id'])
             if not resume_data:
-                return jsonify({
+                return ojsonify({
                     'success': False,
                     'error': 'Resume not found'
                 }), 404
@@ -629,7 +799,7 @@ def analyze_job():
         )
 
         if not analysis_result.get('success'):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': analysis_result.get('error', 'Analysis failed')
             }), 500
@@ -649,11 +819,11 @@ def analyze_job():
             }
         }
 
-        return jsonify(response)
+        return ojsonify(response)
 
     except Exception as e:
         logger.error(f"Job analysis error: {str(e)}", exc_info=True)
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -663,7 +833,7 @@ def regenerate_resume():
     try:
         data = request.json
         if not data.get('resume_id') or not data.get('feedback'):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Resume ID and feedback are required'
             }), 400
@@ -672,20 +842,21 @@ def regenerate_resume():
             resume_id=data['resume_id'],
             feedback=data['feedback']
         )
-        return jsonify(result)
+        _invalidate_resume_cache(data['resume_id'])
+        return ojsonify(result)
         
     except Exception as e:
         logger.error(f"Resume regeneration error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 @app.route('/analyze-job/<resume_id>', methods=['GET', 'POST'])
-def analyze_job_page(resume_id):
+async def analyze_job_page(resume_id):
     """Job analysis page with comprehensive insights"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if request.method == 'POST':
             data = request.json
             
@@ -699,31 +870,31 @@ def analyze_job_page(resume_id):
                     data['job_title'] = job_info['title']
                     data['industry'] = job_info['industry']
 
-            # Analyze job description
-            analysis_result = app.config['job_analyzer'].analyze_job_sync(
-                job_description=data.get('job_description', ''),
-                resume_data=resume_data
-            )
-
-            # Research company
-            company_insights = app.config['job_analyzer'].research_company_sync(
-                company_name=data.get('company_name', ''),
-                job_title=data.get('job_title', '')
-            )
-
-            # Get similar jobs from same company
-            company_jobs = app.config['job_analyzer'].get_company_jobs_sync(
-                company_name=data.get('company_name', ''),
-                job_title=data.get('job_title', '')
-            )
-
-            # Get industry insights
-            industry_data = app.config['job_analyzer'].get_industry_insights_sync(
-                job_title=data.get('job_title', ''),
-                industry=data.get('industry', '')
+            # Job analysis, company research, company jobs and industry insights are
+            # independent LLM/scrape calls, so run them concurrently
+            job_analyzer = app.config['job_analyzer']
+            analysis_result, company_insights, company_jobs, industry_data = await asyncio.gather(
+                job_analyzer.analyze_job(
+                    job_description=data.get('job_description', ''),
+                    resume_data=resume_data
+                ),
+                asyncio.to_thread(
+                    job_analyzer._get_company_insights,
+                    data.get('job_title', '')
+                ),
+                asyncio.to_thread(
+                    job_analyzer.get_similar_jobs_sync,
+                    job_description=data.get('job_description', ''),
+                    company=data.get('company_name', '')
+                ),
+                asyncio.to_thread(
+                    job_analyzer.get_industry_insights_sync,
+                    job_title=data.get('job_title', ''),
+                    industry=data.get('industry', '')
+                )
             )
 
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'analysis': analysis_result,
                 'company_insights': company_insights,
@@ -732,7 +903,7 @@ def analyze_job_page(resume_id):
             })
 
         # GET request - return form data
-        return jsonify({
+        return ojsonify({
             'success': True,
             'resume_id': resume_id,
             'resume_data': resume_data,
@@ -741,7 +912,7 @@ def analyze_job_page(resume_id):
 
     except Exception as e:
         logger.error(f"Job analysis error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -750,10 +921,10 @@ def analyze_job_page(resume_id):
 def job_recommendations(resume_id):
     """Show job recommendations based on resume"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': "Resume not found"
             }), 404
@@ -763,12 +934,12 @@ def job_recommendations(resume_id):
         
         if not result.get('success'):
             logger.error(f"Failed to get recommendations: {result.get('error')}")
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': "Failed to generate recommendations"
             }), 500
 
-        return jsonify({
+        return ojsonify({
             'success': True,
             'resume_data': resume_data,
             'recommendations': result.get('recommendations', {}),
@@ -777,7 +948,7 @@ def job_recommendations(resume_id):
                              
     except Exception as e:
         logger.error(f"Job recommendations error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -786,16 +957,20 @@ def job_recommendations(resume_id):
 def preview_email(resume_id):
     """Email preview page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
-        return jsonify({
+        resume_data = _get_resume_cached(resume_id)
+        etag = _resumes_etag([resume_data] if resume_data else [])
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        return _with_etag(ojsonify({
             'success': True,
             'resume_data': resume_data,
             'resume_id': resume_id,
             'page': 'email_preview'
-        })
+        }), etag)
     except Exception as e:
         logger.error(f"Email preview error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -804,47 +979,40 @@ def preview_email(resume_id):
 def parse_resume():
     try:
         if 'resume' not in request.files:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'No resume file uploaded'
             }), 400
         
         file = request.files['resume']
         if file.filename == '':
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'No file selected'
             }), 400
             
         # Validate file type
-        allowed_extensions = {'.pdf', '.docx', '.doc'}
-        file_ext = os.path.splitext(file.filename)[1].lower()
-        
-        if file_ext not in allowed_extensions:
-            return jsonify({
+        if not allowed_file(file.filename):
+            return ojsonify({
                 'success': False,
-                'error': f'Unsupported file type. Allowed: {", ".join(allowed_extensions)}'
+                'error': f'Unsupported file type. Allowed: {", ".join("." + ext for ext in sorted(ALLOWED_EXTENSIONS))}'
             }), 400
         
-        # Save file temporarily
-        uploads_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
-        os.makedirs(uploads_dir, exist_ok=True)
+        # Save file temporarily (create_app already made the upload folder)
         filename = secure_filename(file.filename)
-        filepath = os.path.join(uploads_dir, filename)
-        file.save(filepath)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{filename}")
+        with open(filepath, 'wb', buffering=0) as dst:
+            shutil.copyfileobj(file.stream, dst, length=UPLOAD_COPY_BUFFER)
         
-        try:
-            # Use sync method instead of async
-            result = app.config['resume_parser'].parse_resume_sync(filepath)
-            return jsonify(result)
-                
-        finally:
-            if os.path.exists(filepath):
-                os.remove(filepath)
+        # Parse in a worker process so extraction doesn't hold this process's GIL;
+        # the worker removes the upload when done
+        # The uuid prefix only keeps concurrent uploads apart on disk; store the user's name
+        result = parse_resume_in_pool(filepath, original_filename=filename)
+        return ojsonify(result)
                 
     except Exception as e:
         logging.error(f"Resume parsing error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -854,14 +1022,15 @@ async def save_resume():
     try:
         data = request.json
         success = app.config['resume_parser'].save_parsed_resume(data)
+        _invalidate_resume_cache(data['_id'])
         
-        return jsonify({
+        return ojsonify({
             'success': success,
             'error': None if success else 'Failed to save to database'
         })
         
     except Exception as e:
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -879,7 +1048,7 @@ def upload_page():
 def mock_interview(resume_id):
     """Mock interview practice page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
@@ -893,15 +1062,18 @@ def mock_interview(resume_id):
         return render_template('error.html', error=str(e))
 
 @app.route('/interview-history/<resume_id>')
-def interview_history(resume_id):
+async def interview_history(resume_id):
     """Interview history page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        # The history lookup only needs the id, so fetch it alongside the resume
+        resume_data, history = await asyncio.gather(
+            asyncio.to_thread(_get_resume_cached, resume_id),
+            asyncio.to_thread(app.config['interview_prep'].get_interview_history, resume_id)
+        )
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
 
-        history = app.config['interview_prep'].get_interview_history(resume_id)
         return render_template('interview_history.html',
                              resume_data=resume_data,
                              history=history,
@@ -915,7 +1087,7 @@ def interview_history(resume_id):
 def interview_feedback(resume_id):
     """Interview feedback page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
@@ -926,7 +1098,7 @@ def interview_feedback(resume_id):
                 resume_id=resume_id,
                 feedback_data=feedback_data
             )
-            return jsonify(result)
+            return ojsonify(result)
 
         return render_template('interview_feedback.html',
                              resume_data=resume_data,
@@ -945,17 +1117,10 @@ def not_found_error(error):
 def internal_error(error):
     return render_template('500.html'), 500
 
-@app.after_request
-def after_request(response):
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
-    response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE')
-    return response
-
 @app.errorhandler(Exception)
 def handle_exception(e):
     logging.error(f"Unhandled exception: {str(e)}")
-    return jsonify({
+    return ojsonify({
         'success': False,
         'error': 'Internal server error'
     }), 500
@@ -963,7 +1128,7 @@ def handle_exception(e):
 def interview_preparation(resume_id):
     """Interview preparation page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
@@ -979,7 +1144,7 @@ def interview_preparation(resume_id):
             )
 
             if not guide.get('success'):
-                return jsonify({
+                return ojsonify({
                     'success': False,
                     'error': guide.get('error', 'Failed to generate guide')
                 }), 500
@@ -991,7 +1156,7 @@ def interview_preparation(resume_id):
             interview_guide.setdefault('company_questions', {})
             interview_guide.setdefault('preparation_tips', {})
             
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'interview_guide': interview_guide
             })
@@ -1004,7 +1169,7 @@ def interview_preparation(resume_id):
     except Exception as e:
         logger.error(f"Interview preparation error: {str(e)}")
         if request.method == 'POST':
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': str(e)
             }), 500
@@ -1013,7 +1178,7 @@ def interview_preparation(resume_id):
 def interview_resources(resume_id):
     """Interview learning resources page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
@@ -1037,12 +1202,12 @@ def interview_resources(resume_id):
 def generate_study_plan(resume_id):
     """Generate personalized study plan"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             return render_template('error.html', error="Resume not found")
 
         # Generate study plan based on resume skills and experience
-        study_plan = app.config['interview_prep']._generate_study_plan(resume_data)
+        study_plan = _get_study_plan(resume_id, resume_data)
         
         return render_template('study_plan.html',
                              resume_data=resume_data,
@@ -1057,7 +1222,7 @@ def resume_suggestions(resume_id):
     """Get comprehensive resume suggestions"""
     try:
         # Get resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
@@ -1083,9 +1248,9 @@ def get_resume_suggestions(resume_id):
     """Get resume suggestions as JSON"""
     try:
         # Get resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = _get_resume_cached(resume_id)
         if not resume_data:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Resume not found'
             }), 404
@@ -1094,40 +1259,20 @@ def get_resume_suggestions(resume_id):
         suggestions = app.config['resume_suggester'].analyze_resume(resume_data)
         
         if not suggestions.get('success'):
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': suggestions.get('error', 'Failed to analyze resume')
             }), 500
 
-        return jsonify(suggestions)
+        return ojsonify(suggestions)
 
     except Exception as e:
         logger.error(f"Resume suggestions error: {str(e)}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
 
-def serialize_resume_data(resume_data):
-    """Convert MongoDB ObjectId to string for JSON serialization"""
-    if isinstance(resume_data, list):
-        return [serialize_resume_data(item) for item in resume_data]
-    
-    if isinstance(resume_data, dict):
-        serialized = {}
-        for key, value in resume_data.items():
-            if isinstance(value, ObjectId):
-                serialized[key] = str(value)
-            elif isinstance(value, dict):
-                serialized[key] = serialize_resume_data(value)
-            elif isinstance(value, list):
-                serialized[key] = serialize_resume_data(value)
-            else:
-                serialized[key] = value
-        return serialized
-    
-    return resume_data
-
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
 
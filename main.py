@@ -1,9 +1,14 @@
-from flask import Flask, request, jsonify, Blueprint, render_template, redirect, send_file
+from flask import Flask, Response, current_app, g, request, jsonify, Blueprint, render_template, redirect, send_file
 import os
 import logging
 import json
 import io
+import hashlib
+import re
+import orjson
 from functools import wraps
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 from cover_letter_generator import CoverLetterGenerator
 from cold_email_generator import ColdEmailGenerator
@@ -12,22 +17,32 @@ from resume_parser import ResumeParser
 from job_analyzer import JobAnalyzer
 from resume_suggester import ResumeSuggester
 from bson import ObjectId
-from typing import List, Dict
+from pymongo import InsertOne, DeleteOne
+from typing import List, Dict, Optional
 from interview_preparation import InterviewPreparation
 from flask_cors import CORS
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
 # from collecter_data import ProfileDataCollector
 from extractor import ProfileAnalyzer
 from user_management import UserManager
 import asyncio
+import copy
+import threading
 import time
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
-from db_pool_manager import get_database, get_connection_stats
-from cache_manager import init_cache_manager, get_cache_manager, cache_set, cache_get, cache_delete, cache_exists
+from datetime import datetime, timedelta
+import atexit
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from db_pool_manager import db_pool, get_database, get_connection_stats
+from cache_manager import init_cache_manager, get_cache_manager, cache_set, cache_get, cache_exists, cache_serialize
 
 # Configure logging with file output
 def setup_logging():
-    """Configure logging to save to files with timestamps"""
+    """Configure logging to save to files with timestamps.
+
+    Request threads only enqueue records; a background QueueListener does the console and file writes.
+    """
     # Create logs directory if it doesn't exist
     logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
     os.makedirs(logs_dir, exist_ok=True)
@@ -54,7 +69,6 @@ def setup_logging():
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     # Create file handler with rotation
     file_handler = RotatingFileHandler(
@@ -65,7 +79,6 @@ def setup_logging():
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
     
     # Create error log file handler
     error_log_filename = f"syntexa_errors_{timestamp}.log"
@@ -78,7 +91,13 @@ def setup_logging():
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
-    root_logger.addHandler(error_handler)
+    
+    # Hand records to a background thread so logging never blocks on disk
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, error_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     # Log startup information
     logger = logging.getLogger(__name__)
@@ -97,10 +116,19 @@ logger = setup_logging()
 
 # Constants
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
-ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx'}
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'doc', 'docx'})
+UPLOAD_IN_MEMORY_LIMIT = 8 * 1024 * 1024  # Larger uploads are spooled to disk before parsing
+RESUME_CACHE_SECONDS = 5 * 60  # Page handlers re-read the same resume while a user navigates
+LLM_RESULT_CACHE_DAYS = 1  # Generated guides and suggestions only depend on their inputs
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+LLM_INFLIGHT_TIMEOUT_SECONDS = 120  # Followers stop waiting on a stuck generation after this
+PROCESS_STARTED = time.time()
+COLLECTIONS_COUNT_REFRESH_SECONDS = 60
+STUDY_PLAN_SOFT_TTL_SECONDS = 60 * 60  # Older plans are still served but regenerated in the background
+STUDY_PLAN_HARD_TTL_SECONDS = 24 * 60 * 60
 
 def is_api_request():
-    """Check if request is asking for JSON response"""
+    """Check if request is asking for JSON response; evaluated once per request into g.is_api"""
     return (
         request.headers.get('Content-Type') == 'application/json' or
         request.headers.get('Accept') == 'application/json' or
@@ -108,9 +136,61 @@ def is_api_request():
         request.args.get('format') == 'json'
     )
 
+def parse_json_body():
+    """Decode a JSON request body once with orjson; None when absent or malformed"""
+    if not request.is_json:
+        return None
+    try:
+        return orjson.loads(request.get_data(cache=True))
+    except orjson.JSONDecodeError:
+        return None
+
+def load_request_json():
+    """Parse the request body onto g.json and its normalized email onto g.email, once per request"""
+    if 'json' not in g:
+        g.json = parse_json_body()
+        body = g.json if isinstance(g.json, dict) else {}
+        email = body.get('email')
+        g.email = email.strip().lower() if isinstance(email, str) else ''
+    return g.json
+
+def ojsonify(obj, status: int = 200, direct_passthrough: bool = False) -> Response:
+    """Build a JSON response with orjson; ObjectIds and other unknown types become strings.
+
+    With direct_passthrough the encoded buffer is handed to the server as-is, for large payloads.
+    """
+    body = orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    if not direct_passthrough:
+        return Response(body, status=status, mimetype='application/json')
+    response = Response([body], status=status, mimetype='application/json', direct_passthrough=True)
+    response.headers['Content-Length'] = str(len(body))
+    return response
+
+# Runs a request's independent database reads side by side
+_request_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='request-io')
+
+# Deletes temporary uploads off the request thread
+_upload_cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='upload-cleanup')
+
+def _remove_upload(path: str) -> None:
+    """Delete a temporary upload, ignoring files that are already gone"""
+    try:
+        os.unlink(path)
+        logger.info(f"Cleaned up temporary file: {path}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not remove temporary file {path}: {e}")
+
+def discard_upload(path: Optional[str]) -> None:
+    """Schedule a temporary upload, if one was written, for deletion without blocking the response"""
+    if path:
+        _upload_cleanup_pool.submit(_remove_upload, path)
+
 def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
-    return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
+    name, dot, ext = filename.rpartition('.')
+    return bool(dot) and bool(name) and ext.lower() in ALLOWED_EXTENSIONS
 
 def auth_required(f):
     """Decorator to require authentication for endpoints"""
@@ -125,7 +205,7 @@ def auth_required(f):
             try:
                 token = auth_header.split(" ")[1]  # Bearer <token>
             except IndexError:
-                if is_api_request():
+                if g.is_api:
                     return jsonify({'success': False, 'error': 'Invalid token format'}), 401
                 return redirect('/login')
         
@@ -138,18 +218,22 @@ def auth_required(f):
             token = request.args.get('token')
         
         if not token:
-            if is_api_request():
+            if g.is_api:
                 return jsonify({'success': False, 'error': 'Token is missing'}), 401
             return redirect('/login')
         
         try:
-            # Verify token using user manager
-            user_manager = UserManager()
+            # Verify token using the app's shared user manager
+            user_manager = current_app.config.get('user_manager')
+            if user_manager is None:
+                if g.is_api:
+                    return jsonify({'success': False, 'error': 'Authentication service unavailable'}), 503
+                return render_template('error.html', error="Authentication service unavailable"), 503
             payload = user_manager.verify_jwt_token(token)
             
             if payload is None:
                 # Token is invalid or expired
-                if is_api_request():
+                if g.is_api:
                     return jsonify({
                         'success': False, 
                         'error': 'Token is invalid or expired',
@@ -159,7 +243,7 @@ def auth_required(f):
             
             # Check if it's an access token
             if payload.get('type') != 'access':
-                if is_api_request():
+                if g.is_api:
                     return jsonify({'success': False, 'error': 'Invalid token type'}), 401
                 return redirect('/login')
             
@@ -169,7 +253,7 @@ def auth_required(f):
             
         except Exception as e:
             logger.error(f"Token verification failed: {str(e)}")
-            if is_api_request():
+            if g.is_api:
                 return jsonify({'success': False, 'error': 'Token verification failed'}), 401
             return redirect('/login')
         
@@ -177,12 +261,63 @@ def auth_required(f):
     
     return decorated_function
 
+def validate_json(required=(), min_lengths=None, missing_error=None):
+    """Check a JSON body's required fields and minimum lengths before the handler runs.
+
+    The body (with its email normalized) is left on g.data for the handler.
+    """
+    min_lengths = min_lengths or {}
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            data = g.json
+            if not isinstance(data, dict):
+                return ojsonify({'success': False, 'error': 'Invalid JSON body'}, 400)
+
+            missing = next((field for field in required if not data.get(field)), None)
+            if missing is not None:
+                error = missing_error or f'{missing.replace("_", " ").title()} is required'
+                return ojsonify({'success': False, 'error': error}, 400)
+
+            for field, length in min_lengths.items():
+                value = data.get(field)
+                if not isinstance(value, str) or len(value) < length:
+                    label = field.replace('_', ' ').capitalize()
+                    return ojsonify({
+                        'success': False,
+                        'error': f'{label} must be at least {length} characters long'
+                    }, 400)
+
+            g.data = dict(data, email=g.email) if 'email' in data else data
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def rate_limit_key_with_email():
+    """Rate limit key combining client IP and the submitted email, for OTP endpoints"""
+    # The limiter's hook runs before before_request, so this may be the body's first parse
+    load_request_json()
+    return f"{get_remote_address()}:{g.email}"
+
+# Throttles the auth endpoints so brute-force traffic is rejected before it reaches bcrypt
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv('RATELIMIT_STORAGE_URI', 'memory://'),
+    headers_enabled=True
+)
+
 def create_app():
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev')
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
     app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
     
+    # Templates only change on deploy, so skip Jinja's per-render mtime check in production
+    if os.getenv('FLASK_ENV', 'production') == 'production':
+        app.config['TEMPLATES_AUTO_RELOAD'] = False
+        app.jinja_env.auto_reload = False
+    
     # Configure CORS with specific origins
     CORS(app, origins=[
         "https://syntexa.app",
@@ -235,7 +370,9 @@ def create_app():
         logger.error(f"✗ Failed to initialize job analyzer: {e}")
         
     try:
-        app.config['interview_prep'] = InterviewPreparation()
+        app.config['interview_prep'] = InterviewPreparation(
+            http_session=getattr(app.config.get('job_analyzer'), 'http_session', None)
+        )
         logger.info("✓ Interview preparation initialized")
     except Exception as e:
         logger.error(f"✗ Failed to initialize interview preparation: {e}")
@@ -255,7 +392,7 @@ def create_app():
     
     # Initialize User Management with database pooling
     try:
-        app.config['user_manager'] = UserManager()
+        app.config['user_manager'] = UserManager(mongo_client=db_pool.get_client('user_manager'))
         logger.info("✓ User manager initialized with database pooling")
     except Exception as e:
         logger.error(f"✗ Failed to initialize user manager: {e}")
@@ -280,9 +417,18 @@ def create_app():
         logger.info(f"Database pool config: max={db_stats['pool_config']['maxPoolSize']}, min={db_stats['pool_config']['minPoolSize']}")
     except Exception as e:
         logger.warning(f"Could not get database pool stats: {e}")
+    limiter.init_app(app)
+    
     @app.errorhandler(405)
     def method_not_allowed(e):
         return make_response({"error": "Method Not Allowed"}, 405)
+    
+    @app.errorhandler(429)
+    def rate_limited(e):
+        return ojsonify({
+            'success': False,
+            'error': 'Too many requests. Please try again later.'
+        }, 429)
     return app
 
 app = create_app()
@@ -307,7 +453,7 @@ def health_check():
             'success': True,
             'status': 'healthy' if db_healthy else 'degraded',
             'message': 'Resume AI API is running',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(g.request_started).isoformat(),
             'database': {
                 'status': 'healthy' if db_healthy else 'unhealthy',
                 'active_connections': db_stats.get('active_connections', 0),
@@ -337,7 +483,7 @@ def health_check():
             'success': False,
             'status': 'unhealthy',
             'message': f'Health check failed: {str(e)}',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.fromtimestamp(g.request_started).isoformat()
         }), 500
 
 @app.route('/api/system/db-stats', methods=['GET'])
@@ -351,7 +497,7 @@ def get_db_stats():
             'python_version': os.sys.version,
             'flask_debug': app.debug,
             'environment': os.getenv('FLASK_ENV', 'production'),
-            'uptime': str(datetime.now() - datetime.fromtimestamp(time.time()))
+            'uptime': str(timedelta(seconds=int(g.request_started - PROCESS_STARTED)))
         }
         
         return jsonify({
@@ -366,6 +512,17 @@ def get_db_stats():
             'error': str(e)
         }), 500
 
+# Namespace listing is slow on large clusters, so the connection test reuses a recent count
+_collections_count = {'value': 0, 'refreshed_at': 0.0}
+
+def get_collections_count(db) -> int:
+    """Return the collection count of db, refreshed at most once a minute"""
+    now = time.monotonic()
+    if now - _collections_count['refreshed_at'] >= COLLECTIONS_COUNT_REFRESH_SECONDS:
+        _collections_count['value'] = len(db.list_collection_names())
+        _collections_count['refreshed_at'] = now
+    return _collections_count['value']
+
 @app.route('/api/system/connection-test', methods=['POST'])
 def test_database_connection():
     """Test database connection and perform basic operations"""
@@ -378,27 +535,27 @@ def test_database_connection():
         }
         
         # Test basic connection
-        start_time = time.time()
+        start_time = time.perf_counter()
         test_db = get_database('test_connection')
         test_db.command('ping')
         test_results['connection_test'] = True
-        test_results['timing']['connection'] = (time.time() - start_time) * 1000
+        test_results['timing']['connection'] = (time.perf_counter() - start_time) * 1000
         
         # Test read operation
-        start_time = time.time()
-        collections = test_db.list_collection_names()
-        test_results['read_test'] = True
-        test_results['timing']['read'] = (time.time() - start_time) * 1000
-        test_results['collections_count'] = len(collections)
-        
-        # Test write operation (insert and delete a test document)
-        start_time = time.time()
         test_collection = test_db.connection_test
-        test_doc = {'test': True, 'timestamp': datetime.now()}
-        insert_result = test_collection.insert_one(test_doc)
-        test_collection.delete_one({'_id': insert_result.inserted_id})
+        start_time = time.perf_counter()
+        test_collection.estimated_document_count()
+        test_results['read_test'] = True
+        test_results['timing']['read'] = (time.perf_counter() - start_time) * 1000
+        test_results['collections_count'] = get_collections_count(test_db)
+        
+        # Test write operation (insert and delete a test document in one round-trip)
+        start_time = time.perf_counter()
+        test_id = ObjectId()
+        test_doc = {'_id': test_id, 'test': True, 'timestamp': datetime.fromtimestamp(g.request_started)}
+        test_collection.bulk_write([InsertOne(test_doc), DeleteOne({'_id': test_id})])
         test_results['write_test'] = True
-        test_results['timing']['write'] = (time.time() - start_time) * 1000
+        test_results['timing']['write'] = (time.perf_counter() - start_time) * 1000
         
         return jsonify({
             'success': True,
@@ -419,35 +576,22 @@ def test_database_connection():
 # ===============================
 
 @app.route('/api/auth/signup', methods=['POST'])
+@limiter.limit("5/hour")
+@validate_json(required=('first_name', 'last_name', 'email', 'password'), min_lengths={'password': 8})
 def signup():
     """User registration endpoint"""
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['first_name', 'last_name', 'email', 'password']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'error': f'{field.replace("_", " ").title()} is required'
-                }), 400
+        data = g.data
         
         # Basic email validation
-        email = data['email'].strip().lower()
-        if '@' not in email or '.' not in email:
-            return jsonify({
+        email = g.email
+        if not EMAIL_RE.match(email):
+            return ojsonify({
                 'success': False,
                 'error': 'Invalid email format'
-            }), 400
+            }, 400)
         
-        # Password validation
         password = data['password']
-        if len(password) < 8:
-            return jsonify({
-                'success': False,
-                'error': 'Password must be at least 8 characters long'
-            }), 400
         
         # Register user
         result = app.config['user_manager'].signup(
@@ -458,221 +602,145 @@ def signup():
         )
         
         if result['success']:
-            return jsonify(result), 201
+            return ojsonify(result, 201)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Signup error: {str(e)}")
-        return jsonify({
+        logger.error("Signup error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Registration failed. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/verify-email', methods=['POST'])
+@limiter.limit("3/minute;10/hour", key_func=rate_limit_key_with_email)
+@validate_json(required=('email', 'otp'), missing_error='Email and OTP are required')
 def verify_email():
     """Email verification endpoint"""
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        if not data.get('email') or not data.get('otp'):
-            return jsonify({
-                'success': False,
-                'error': 'Email and OTP are required'
-            }), 400
+        data = g.data
         
         # Verify email
         result = app.config['user_manager'].verify_email(
-            email=data['email'].strip().lower(),
+            email=g.email,
             otp=data['otp'].strip()
         )
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Email verification error: {str(e)}")
-        return jsonify({
+        logger.error("Email verification error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Email verification failed. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/resend-verification', methods=['POST'])
+@limiter.limit("3/minute;10/hour", key_func=rate_limit_key_with_email)
+@validate_json(required=('email',), missing_error='Email is required')
 def resend_verification():
     """Resend verification OTP endpoint"""
     try:
-        data = request.get_json()
-        
-        if not data.get('email'):
-            return jsonify({
-                'success': False,
-                'error': 'Email is required'
-            }), 400
-        
         # Resend verification OTP
         result = app.config['user_manager'].resend_verification_otp(
-            email=data['email'].strip().lower()
+            email=g.email
         )
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Resend verification error: {str(e)}")
-        return jsonify({
+        logger.error("Resend verification error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Failed to resend verification code. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/login', methods=['POST'])
+@limiter.limit("5/minute;30/hour")
+@validate_json(required=('email', 'password'), missing_error='Email and password are required')
 def login():
     """User login endpoint"""
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        if not data.get('email') or not data.get('password'):
-            return jsonify({
-                'success': False,
-                'error': 'Email and password are required'
-            }), 400
+        data = g.data
         
         # Login user
         result = app.config['user_manager'].login(
-            email=data['email'].strip().lower(),
+            email=g.email,
             password=data['password']
         )
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
             status_code = 401 if 'Invalid email or password' in result.get('error', '') else 400
-            return jsonify(result), status_code
+            return ojsonify(result, status_code)
             
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
-        return jsonify({
+        logger.error("Login error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Login failed. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/forgot-password', methods=['POST'])
+@limiter.limit("5/minute;30/hour")
+@validate_json(required=('email',), missing_error='Email is required')
 def forgot_password():
     """Forgot password endpoint"""
     try:
-        data = request.get_json()
-        
-        if not data.get('email'):
-            return jsonify({
-                'success': False,
-                'error': 'Email is required'
-            }), 400
-        
         # Send password reset OTP
         result = app.config['user_manager'].forgot_password(
-            email=data['email'].strip().lower()
+            email=g.email
         )
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Forgot password error: {str(e)}")
-        return jsonify({
+        logger.error("Forgot password error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Failed to send password reset code. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/reset-password', methods=['POST'])
+@limiter.limit("3/minute;10/hour", key_func=rate_limit_key_with_email)
+@validate_json(required=('email', 'otp', 'new_password'), min_lengths={'new_password': 8})
 def reset_password():
     """Reset password endpoint"""
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['email', 'otp', 'new_password']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'error': f'{field.replace("_", " ").title()} is required'
-                }), 400
-        
-        # Password validation
-        if len(data['new_password']) < 8:
-            return jsonify({
-                'success': False,
-                'error': 'Password must be at least 8 characters long'
-            }), 400
+        data = g.data
         
         # Reset password
         result = app.config['user_manager'].reset_password(
-            email=data['email'].strip().lower(),
+            email=g.email,
             otp=data['otp'].strip(),
             new_password=data['new_password']
         )
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Reset password error: {str(e)}")
-        return jsonify({
+        logger.error("Reset password error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Password reset failed. Please try again.'
-        }), 500
-
-@app.route('/api/auth/change-password', methods=['POST'])
-def change_password():
-    """Change password endpoint (requires authentication)"""
-    try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['current_password', 'new_password']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'error': f'{field.replace("_", " ").title()} is required'
-                }), 400
-        
-        # Password validation
-        if len(data['new_password']) < 8:
-            return jsonify({
-                'success': False,
-                'error': 'New password must be at least 8 characters long'
-            }), 400
-        
-        # Change password
-        result = app.config['user_manager'].change_password(
-            user_id=request.user_id,
-            current_password=data['current_password'],
-            new_password=data['new_password']
-        )
-        
-        if result['success']:
-            return jsonify(result), 200
-        else:
-            return jsonify(result), 400
-            
-    except Exception as e:
-        logger.error(f"Change password error: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Password change failed. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/verify-token', methods=['POST'])
+@auth_required
 def verify_token():
     """Verify JWT token endpoint"""
     try:
@@ -680,35 +748,30 @@ def verify_token():
         result = app.config['user_manager'].get_user_profile(request.user_id)
         
         if result['success']:
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'message': 'Token is valid',
                 'user': result['user']
-            }), 200
+            })
         else:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Failed to get user profile'
-            }), 400
+            }, 400)
             
     except Exception as e:
-        logger.error(f"Token verification error: {str(e)}")
-        return jsonify({
+        logger.error("Token verification error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Token verification failed'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/refresh', methods=['POST'])
+@validate_json(required=('refresh_token',), missing_error='Refresh token is required')
 def refresh_token():
     """Refresh access token endpoint"""
     try:
-        data = request.get_json()
-        
-        if not data.get('refresh_token'):
-            return jsonify({
-                'success': False,
-                'error': 'Refresh token is required'
-            }), 400
+        data = g.data
         
         # Refresh access token
         result = app.config['user_manager'].refresh_access_token(
@@ -716,23 +779,23 @@ def refresh_token():
         )
         
         if result:
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'access_token': result['access_token'],
                 'refresh_token': result['refresh_token']
-            }), 200
+            })
         else:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Invalid or expired refresh token'
-            }), 401
+            }, 401)
             
     except Exception as e:
-        logger.error(f"Token refresh error: {str(e)}")
-        return jsonify({
+        logger.error("Token refresh error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Token refresh failed'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/logout', methods=['POST'])
 @auth_required
@@ -743,54 +806,53 @@ def logout():
         success = app.config['user_manager'].revoke_refresh_token(request.user_id)
         
         if success:
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'message': 'Logged out successfully'
-            }), 200
+            })
         else:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Logout failed'
-            }), 400
+            }, 400)
             
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
-        return jsonify({
+        logger.error("Logout error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Logout failed'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/status', methods=['GET'])
 def auth_status():
     """Check authentication status without requiring authentication"""
     try:
-        token = None
-        
-        # Check Authorization header
-        if 'Authorization' in request.headers:
-            auth_header = request.headers['Authorization']
-            try:
-                token = auth_header.split(" ")[1]
-            except IndexError:
-                pass
-        
-        # Check cookies
-        elif 'syntexa_access_token' in request.cookies:
+        # Bearer token from the Authorization header, falling back to the cookie
+        auth_header = request.headers.get('Authorization', '')
+        if auth_header.startswith('Bearer '):
+            token = auth_header[7:].strip()
+        else:
             token = request.cookies.get('syntexa_access_token')
         
         if not token:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'authenticated': False,
                 'message': 'No token found'
             })
         
-        # Verify token
-        user_manager = UserManager()
+        # Verify token with the app's shared user manager
+        user_manager = app.config.get('user_manager')
+        if user_manager is None:
+            return ojsonify({
+                'success': False,
+                'authenticated': False,
+                'message': 'Authentication service unavailable'
+            }, 503)
         payload = user_manager.verify_jwt_token(token)
         
         if payload and payload.get('type') == 'access':
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'authenticated': True,
                 'user': {
@@ -799,43 +861,45 @@ def auth_status():
                 }
             })
         else:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'authenticated': False,
                 'message': 'Invalid or expired token'
             })
             
     except Exception as e:
-        logger.error(f"Auth status check error: {str(e)}")
-        return jsonify({
+        logger.error("Auth status check error: %s", e)
+        return ojsonify({
             'success': False,
             'authenticated': False,
             'error': str(e)
         })
 
 @app.route('/api/auth/profile', methods=['GET'])
+@auth_required
 def get_profile():
     """Get user profile endpoint"""
     try:
         result = app.config['user_manager'].get_user_profile(request.user_id)
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
-            return jsonify(result), 404
+            return ojsonify(result, 404)
             
     except Exception as e:
-        logger.error(f"Get profile error: {str(e)}")
-        return jsonify({
+        logger.error("Get profile error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Failed to get profile. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/profile', methods=['PUT'])
+@auth_required
 def update_profile():
     """Update user profile endpoint"""
     try:
-        data = request.get_json()
+        data = g.json
         
         # Update profile
         result = app.config['user_manager'].update_profile(
@@ -844,33 +908,28 @@ def update_profile():
         )
         
         if result['success']:
-            return jsonify(result), 200
+            return ojsonify(result)
         else:
-            return jsonify(result), 400
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Update profile error: {str(e)}")
-        return jsonify({
+        logger.error("Update profile error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Profile update failed. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/delete-account', methods=['DELETE'])
 @auth_required
+@validate_json(required=('password',), missing_error='Password is required to delete account')
 def delete_account():
     """Soft delete user account endpoint (mark as deleted)"""
     try:
-        data = request.get_json()
+        data = g.data
         user_id = getattr(request, 'user_id', None)
         user_email = getattr(request, 'user_email', None)
         
-        logger.info(f"Account deletion request for user: {user_email} (ID: {user_id})")
-        
-        if not data.get('password'):
-            return jsonify({
-                'success': False,
-                'error': 'Password is required to delete account'
-            }), 400
+        logger.info("Account deletion request for user: %s (ID: %s)", user_email, user_id)
         
         # Soft delete account (mark as deleted)
         result = app.config['user_manager'].soft_delete_account(
@@ -879,18 +938,48 @@ def delete_account():
         )
         
         if result['success']:
-            logger.info(f"Account soft deleted successfully for user: {user_email} (ID: {user_id})")
-            return jsonify(result), 200
+            logger.info("Account soft deleted successfully for user: %s (ID: %s)", user_email, user_id)
+            return ojsonify(result)
         else:
-            logger.error(f"Account deletion failed for user: {user_email} (ID: {user_id}): {result.get('error')}")
-            return jsonify(result), 400
+            logger.error("Account deletion failed for user: %s (ID: %s): %s", user_email, user_id, result.get('error'))
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Delete account error: {str(e)}")
-        return jsonify({
+        logger.error("Delete account error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Account deletion failed. Please try again.'
-        }), 500
+        }, 500)
+
+# Resume fields included in a data export; file content and raw text are left out for size
+EXPORT_RESUME_PROJECTION = {'original_filename': 1, 'upload_date': 1, 'parsed_data': 1, 'analysis': 1, 'metadata': 1}
+
+def iter_export_json(user_label, export_date, user_profile, resumes):
+    """Stream a data export as JSON, encoding one resume at a time.
+
+    Each record goes to orjson as-is: datetimes are encoded natively and ObjectIds through default=str,
+    so nested parsed_data, analysis and metadata are never walked in Python.
+    """
+    yield (b'{"export_date":' + orjson.dumps(export_date)
+           + b',"user_profile":' + orjson.dumps(user_profile, default=str, option=orjson.OPT_NON_STR_KEYS)
+           + b',"resumes":[')
+    dumps = orjson.dumps
+    option = orjson.OPT_NON_STR_KEYS
+    total = 0
+    for resume in resumes:
+        get = resume.get
+        resume_data = {
+            'id': str(get('_id', '')),
+            'filename': get('original_filename', ''),
+            'upload_date': get('upload_date', ''),  # orjson writes datetimes as ISO 8601 itself
+            'parsed_data': get('parsed_data', {}),
+            'analysis': get('analysis', {}),
+            'metadata': get('metadata', {})
+        }
+        yield (b',' if total else b'') + dumps(resume_data, default=str, option=option)
+        total += 1
+    yield b'],"total_resumes":' + str(total).encode() + b'}'
+    logger.info("Data export completed for user: %s - %s resumes exported", user_label, total)
 
 @app.route('/api/auth/export-data', methods=['GET'])
 @auth_required
@@ -899,67 +988,55 @@ def export_user_data():
     try:
         user_id = getattr(request, 'user_id', None)
         user_email = getattr(request, 'user_email', None)
+        export_date = datetime.utcnow().isoformat()
+        file_date = datetime.now().strftime("%Y%m%d")
         
-        logger.info(f"Data export request for user: {user_email} (ID: {user_id})")
+        logger.info("Data export request for user: %s (ID: %s)", user_email, user_id)
         
-        # Get user profile
-        profile_result = app.config['user_manager'].get_user_profile(user_id)
+        # Fetch the profile on the I/O pool while this thread pulls the first batch of resumes
+        profile_future = _request_io_pool.submit(app.config['user_manager'].get_user_profile, user_id)
         
-        # Get user resumes
-        resumes = app.config['resume_parser'].get_all_resumes_sync(user_id)
-        
-        # Prepare export data
-        export_data = {
-            'export_date': datetime.utcnow().isoformat(),
-            'user_profile': profile_result.get('user', {}) if profile_result.get('success') else {},
-            'resumes': [],
-            'total_resumes': len(resumes)
-        }
-        
-        # Add resume data (without file content for size reasons)
-        for resume in resumes:
-            resume_data = {
-                'id': str(resume.get('_id', '')),
-                'filename': resume.get('original_filename', ''),
-                'upload_date': resume.get('upload_date', '').isoformat() if hasattr(resume.get('upload_date', ''), 'isoformat') else str(resume.get('upload_date', '')),
-                'parsed_data': serialize_resume_data(resume.get('parsed_data', {})),
-                'analysis': serialize_resume_data(resume.get('analysis', {})),
-                'metadata': serialize_resume_data(resume.get('metadata', {}))
-            }
-            export_data['resumes'].append(resume_data)
-        
-        logger.info(f"Data export completed for user: {user_email} (ID: {user_id}) - {len(resumes)} resumes exported")
+        # Get user resumes as a cursor; they are encoded while the response streams
+        resumes = app.config['resume_parser'].iter_resumes(user_id, EXPORT_RESUME_PROJECTION)
+        first_resume = next(resumes, None)
+        if first_resume is not None:
+            resumes = chain((first_resume,), resumes)
+        profile_result = profile_future.result()
         
         # Return as downloadable JSON
-        response = jsonify(export_data)
-        response.headers['Content-Disposition'] = f'attachment; filename=syntexa_data_export_{user_id}_{datetime.now().strftime("%Y%m%d")}.json'
-        response.headers['Content-Type'] = 'application/json'
+        response = Response(
+            iter_export_json(
+                f"{user_email} (ID: {user_id})",
+                export_date,
+                profile_result.get('user', {}) if profile_result.get('success') else {},
+                resumes
+            ),
+            mimetype='application/json'
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename=syntexa_data_export_{user_id}_{file_date}.json'
         
         return response
         
     except Exception as e:
-        logger.error(f"Export data error: {str(e)}")
-        return jsonify({
+        logger.error("Export data error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Data export failed. Please try again.'
-        }), 500
+        }, 500)
 
 @app.route('/api/auth/change-password', methods=['POST'])
 @auth_required
-def change_password_api():
+@limiter.limit("5/minute")
+@validate_json(required=('current_password', 'new_password'), min_lengths={'new_password': 8},
+               missing_error='Current password and new password are required')
+def change_password():
     """Change user password endpoint"""
     try:
-        data = request.get_json()
+        data = g.data
         user_id = getattr(request, 'user_id', None)
         user_email = getattr(request, 'user_email', None)
         
-        logger.info(f"Password change request for user: {user_email} (ID: {user_id})")
-        
-        if not all([data.get('current_password'), data.get('new_password')]):
-            return jsonify({
-                'success': False,
-                'error': 'Current password and new password are required'
-            }), 400
+        logger.info("Password change request for user: %s (ID: %s)", user_email, user_id)
         
         # Change password
         result = app.config['user_manager'].change_password(
@@ -969,18 +1046,18 @@ def change_password_api():
         )
         
         if result['success']:
-            logger.info(f"Password changed successfully for user: {user_email} (ID: {user_id})")
-            return jsonify(result), 200
+            logger.info("Password changed successfully for user: %s (ID: %s)", user_email, user_id)
+            return ojsonify(result)
         else:
-            logger.error(f"Password change failed for user: {user_email} (ID: {user_id}): {result.get('error')}")
-            return jsonify(result), 400
+            logger.error("Password change failed for user: %s (ID: %s): %s", user_email, user_id, result.get('error'))
+            return ojsonify(result, 400)
             
     except Exception as e:
-        logger.error(f"Change password error: {str(e)}")
-        return jsonify({
+        logger.error("Change password error: %s", e)
+        return ojsonify({
             'success': False,
             'error': 'Password change failed. Please try again.'
-        }), 500
+        }, 500)
 
 # ===============================
 # END AUTHENTICATION ENDPOINTS
@@ -1022,25 +1099,23 @@ def index():
         elif 'syntexa_access_token' in request.cookies:
             token = request.cookies.get('syntexa_access_token')
         
-        if token:
-            # Verify token
+        user_manager = app.config.get('user_manager')
+        if token and user_manager is not None:
+            # Verify token with the app's shared user manager; its verified-token cache
+            # makes repeat visits skip the decode
             try:
-                user_manager = UserManager()
                 payload = user_manager.verify_jwt_token(token)
                 
                 if payload and payload.get('type') == 'access':
                     # User is authenticated, check if they have resumes
                     try:
                         user_id = payload.get('user_id')
-                        if user_id:
-                            # Get user-specific resumes
-                            resumes = app.config['resume_parser'].get_all_resumes_sync(user_id=user_id)
-                        if resumes and len(resumes) > 0:
-                                # User has resumes, redirect to dashboard with most recent resume
-                                most_recent_resume = resumes[0]  # resumes are already sorted by upload_date desc
-                                resume_id = str(most_recent_resume.get('_id'))
-                                logger.info(f"Redirecting user {user_id} to dashboard with resume {resume_id}")
-                                return redirect(f'/dashboard/{resume_id}')
+                        # Only the newest resume's id is needed for the redirect
+                        resume_id = app.config['resume_parser'].get_latest_resume_id_sync(user_id) if user_id else None
+                        if resume_id:
+                            # User has resumes, redirect to dashboard with most recent resume
+                            logger.info(f"Redirecting user {user_id} to dashboard with resume {resume_id}")
+                            return redirect(f'/dashboard/{resume_id}')
                         else:
                             # User has no resumes, redirect to upload
                             logger.info(f"User {user_id} has no resumes, redirecting to upload")
@@ -1068,13 +1143,11 @@ def get_recent_resumes():
         limit = request.args.get('limit', 3, type=int)
         resumes = app.config['resume_parser'].get_recent_resumes_sync(limit=limit)
         
-        # Serialize ObjectIds to strings
-        serialized_resumes = serialize_resume_data(resumes)
-        
-        return jsonify({
+        # ojsonify turns ObjectIds into strings while encoding, no pre-walk needed
+        return ojsonify({
             'success': True,
-            'resumes': serialized_resumes,
-            'count': len(serialized_resumes)
+            'resumes': resumes,
+            'count': len(resumes)
         })
         
     except Exception as e:
@@ -1084,6 +1157,8 @@ def get_recent_resumes():
             'error': str(e)
         }), 500
 
+MY_RESUMES_PROJECTION = {'original_filename': 1, 'upload_date': 1}
+
 @app.route('/my-resumes')
 @auth_required
 def my_resumes():
@@ -1091,15 +1166,17 @@ def my_resumes():
     try:
         if 'resume_parser' not in app.config:
             return jsonify({'success': False, 'error': 'Resume parser not initialized'}), 500
-        resumes = app.config['resume_parser'].get_all_resumes_sync(user_id=request.user_id)
+        # Only the listing fields come back from Mongo, not every parsed resume and analysis
+        resumes = app.config['resume_parser'].iter_resumes(request.user_id, MY_RESUMES_PROJECTION)
         result = []
         for resume in resumes:
+            resume_id = str(resume.get('_id'))
             result.append({
-                'id': str(resume.get('_id')),
+                'id': resume_id,
                 'name': resume.get('original_filename', 'Resume'),
                 'upload_date': str(resume.get('upload_date', 'Unknown')),
-                'dashboard_url': f"/dashboard/{resume.get('_id')}",
-                'ats_url': f"/generate-ats-resume/{resume.get('_id')}"
+                'dashboard_url': f"/dashboard/{resume_id}",
+                'ats_url': f"/generate-ats-resume/{resume_id}"
             })
         return jsonify({'success': True, 'resumes': result})
     except Exception as e:
@@ -1122,12 +1199,19 @@ def dashboard(resume_id):
             return render_template('error.html', 
                                 error="You don't have permission to access this resume"), 403
 
+        # Interview stats and analytics are independent lookups; run them side by side. The components
+        # are looked up in the worker so a missing one surfaces from result() and falls back below
+        stats_future = _request_io_pool.submit(
+            lambda: app.config['interview_prep'].get_interview_statistics(resume_id))
+        analytics_future = _request_io_pool.submit(
+            lambda: app.config['job_analyzer'].get_resume_analytics(resume_id))
+
         # Serialize the resume data to handle ObjectId conversion
         serialized_resume_data = serialize_resume_data(resume_data)
 
         # Get interview statistics
         try:
-            interview_stats = app.config['interview_prep'].get_interview_statistics(resume_id)
+            interview_stats = stats_future.result()
         except Exception as e:
             logger.warning(f"Could not get interview stats: {str(e)}")
             interview_stats = {
@@ -1139,7 +1223,7 @@ def dashboard(resume_id):
 
         # Get resume analytics from backend
         try:
-            analytics_result = app.config['job_analyzer'].get_resume_analytics(resume_id)
+            analytics_result = analytics_future.result()
             if analytics_result['success']:
                 analytics = analytics_result['analytics']
                 logger.info(f"Analytics loaded for resume {resume_id} (cached: {analytics_result.get('cached', False)})")
@@ -1292,9 +1376,16 @@ def dashboard_json(resume_id):
                 'error': 'Resume not found'
             }), 404
 
+        # Interview stats and the ATS score don't depend on each other; fetch them concurrently
+        stats_future = _request_io_pool.submit(
+            lambda: app.config['interview_prep'].get_interview_statistics(resume_id))
+        resume_gen = app.config.get('resume_gen')
+        ats_future = (_request_io_pool.submit(resume_gen.calculate_ats_scores_sync, resume_data)
+                      if resume_gen is not None and hasattr(resume_gen, 'calculate_ats_scores_sync') else None)
+
         # Get interview statistics
         try:
-            interview_stats = app.config['interview_prep'].get_interview_statistics(resume_id)
+            interview_stats = stats_future.result()
         except Exception as e:
             logger.warning(f"Could not get interview stats: {str(e)}")
             interview_stats = {
@@ -1313,8 +1404,8 @@ def dashboard_json(resume_id):
 
         # Try to get ATS score
         try:
-            if hasattr(app.config['resume_gen'], 'calculate_ats_scores_sync'):
-                ats_result = app.config['resume_gen'].calculate_ats_scores_sync(resume_data)
+            if ats_future is not None:
+                ats_result = ats_future.result()
                 analytics['ats_score'] = ats_result.get('overall', 0)
         except Exception as e:
             logger.warning(f"Could not calculate ATS score: {str(e)}")
@@ -1329,13 +1420,10 @@ def dashboard_json(resume_id):
             'certifications_count': len(parsed_data.get('certifications', []))
         }
 
-        # Serialize the resume data
-        serialized_resume = serialize_resume_data(resume_data)
-
         # Return comprehensive dashboard data
         dashboard_data = {
             'success': True,
-            'resume_data': serialized_resume,
+            'resume_data': resume_data,
             'interview_stats': interview_stats,
             'analytics': analytics,
             'summary_stats': summary_stats,
@@ -1347,7 +1435,7 @@ def dashboard_json(resume_id):
             }
         }
 
-        return jsonify(dashboard_data)
+        return ojsonify(dashboard_data)
 
     except Exception as e:
         logger.error(f"Dashboard error: {str(e)}")
@@ -1634,16 +1722,21 @@ def upload_resume():
                 'error': 'File too large. Maximum size: 16MB'
             }), 400
 
-        # Save file temporarily
         filename = secure_filename(file.filename)
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        logger.info(f"Saving file to: {temp_path} for user: {user_email} (ID: {user_id})")
-        file.save(temp_path)
+        temp_path = None
+        file_data = None
+        if file_size <= UPLOAD_IN_MEMORY_LIMIT:
+            # Small uploads are parsed straight from memory, skipping the temp file
+            file_data = file.read()
+        else:
+            temp_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+            logger.info(f"Saving file to: {temp_path} for user: {user_email} (ID: {user_id})")
+            file.save(temp_path)
 
         try:
             # Parse resume with user_id for multi-user support
             logger.info(f"Starting resume parsing for: {filename} for user: {user_email} (ID: {user_id})")
-            result = app.config['resume_parser'].parse_resume(temp_path, user_id=user_id)
+            result = app.config['resume_parser'].parse_resume(temp_path or filename, user_id=user_id, file_data=file_data)
             logger.info(f"Parse result: {result.get('success', 'Unknown')} - {result.get('error', 'No error info')} for user: {user_email} (ID: {user_id})")
             
             if result.get('success'):
@@ -1651,32 +1744,28 @@ def upload_resume():
                 logger.info(f"Resume parsing successful, Resume ID: {resume_id} for user: {user_email} (ID: {user_id})")
                 
                 # Clean up temporary file after successful processing
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    logger.info(f"Cleaned up temporary file: {temp_path}")
+                discard_upload(temp_path)
                 
-                # Serialize the parsed data to handle ObjectIds
+                # ojsonify converts any ObjectIds in the parsed data while encoding
                 serialized_result = {
                     'success': True,
                     'resume_id': resume_id,
                     'file_id': str(result['file_id']) if result.get('file_id') else None,
-                    'parsed_data': serialize_resume_data(result.get('parsed_data', {})),
-                    'metadata': serialize_resume_data(result.get('metadata', {})),
+                    'parsed_data': result.get('parsed_data', {}),
+                    'metadata': result.get('metadata', {}),
                     'message': 'Resume uploaded and processed successfully',
                     'redirect_url': f'/dashboard/{resume_id}'
                 }
                 
                 logger.info(f"Returning successful response for Resume ID: {resume_id}, user: {user_email} (ID: {user_id})")
-                return jsonify(serialized_result), 200
+                return ojsonify(serialized_result)
             else:
                 error_msg = result.get('error', 'Unknown error')
                 error_details = result.get('details', '')
                 logger.error(f"Resume parsing failed: {error_msg} for user: {user_email} (ID: {user_id})")
                 
                 # Clean up temporary file on failure
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    logger.info(f"Cleaned up temporary file: {temp_path}")
+                discard_upload(temp_path)
                 
                 return jsonify({
                     'success': False,
@@ -1693,8 +1782,7 @@ def upload_resume():
         except Exception as parse_error:
             logger.error(f"Exception during parsing: {str(parse_error)} for user: {user_email} (ID: {user_id})", exc_info=True)
             # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            discard_upload(temp_path)
 
     except Exception as e:
         logger.error(f"Upload error: {str(e)}")
@@ -2098,26 +2186,36 @@ def upload_page():
 #         return render_template('error.html', error=str(e))
 
 
+# Error pages never vary, so each is rendered once and then served from memory
+_error_pages = {}
+
+def static_error_page(template: str, **context) -> str:
+    """Render an error page on first use and reuse the HTML afterwards"""
+    page = _error_pages.get(template)
+    if page is None:
+        page = _error_pages[template] = render_template(template, **context)
+    return page
+
 @app.errorhandler(404)
 def not_found_error(error):
-    return render_template('404.html'), 404
+    return static_error_page('404.html'), 404
 
 @app.errorhandler(500)
 def internal_error(error):
-    return render_template('500.html'), 500
+    return static_error_page('error.html', error='Internal server error'), 500
 
 # Add error handling middleware
 @app.before_request
 def before_request():
-    """Log all requests"""
+    """Log all requests, record their start time and whether they expect JSON"""
+    g.request_started = time.time()
+    g.is_api = is_api_request()
+    load_request_json()
     logger.info(f"{request.method} {request.path} - {request.remote_addr}")
 
 @app.after_request
 def after_request(response):
-    """Add CORS headers and log response"""
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-    response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS')
+    """Log response; CORS headers come from the CORS(app) setup in create_app"""
     logger.info(f"Response: {response.status_code}")
     return response
 
@@ -2143,7 +2241,7 @@ def handle_exception(e):
 def interview_preparation(resume_id):
     """Interview preparation page"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
@@ -2152,10 +2250,16 @@ def interview_preparation(resume_id):
             data = request.json
             
             # Generate comprehensive interview guide
-            guide = app.config['interview_prep'].prepare_interview_guide(
-                resume_data=resume_data,
-                job_description=data.get('job_description', ''),
-                company_name=data.get('company_name', '')
+            job_description = data.get('job_description', '')
+            company_name = data.get('company_name', '')
+            guide = get_llm_result_cached(
+                'interview_guide',
+                (resume_id, job_description, company_name),
+                lambda: app.config['interview_prep'].prepare_interview_guide(
+                    resume_data=resume_data,
+                    job_description=job_description,
+                    company_name=company_name
+                )
             )
 
             if not guide.get('success'):
@@ -2193,7 +2297,7 @@ def interview_preparation(resume_id):
 # def interview_resources(resume_id):
 #     """Interview learning resources page"""
 #     try:
-#         resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+#         resume_data = get_resume_cached(resume_id)
 #         if not resume_data:
 #             logger.error(f"Resume not found: {resume_id}")
 #             return render_template('error.html', error="Resume not found")
@@ -2214,12 +2318,18 @@ def interview_preparation(resume_id):
 def generate_study_plan(resume_id):
     """Generate personalized study plan"""
     try:
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = get_resume_cached(resume_id)
         if not resume_data:
             return render_template('error.html', error="Resume not found")
 
         # Generate study plan based on resume skills and experience
-        study_plan = app.config['interview_prep']._generate_study_plan(resume_data)
+        study_plan = get_result_stale_while_revalidate(
+            'study_plan',
+            (resume_id, get_resume_version(resume_data)),
+            lambda: app.config['interview_prep']._generate_study_plan(resume_data),
+            soft_ttl=STUDY_PLAN_SOFT_TTL_SECONDS,
+            hard_ttl=STUDY_PLAN_HARD_TTL_SECONDS
+        )
         
         return render_template('study_plan.html',
                              resume_data=resume_data,
@@ -2234,13 +2344,17 @@ def resume_suggestions(resume_id):
     """Get comprehensive resume suggestions"""
     try:
         # Get resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = get_resume_cached(resume_id)
         if not resume_data:
             logger.error(f"Resume not found: {resume_id}")
             return render_template('error.html', error="Resume not found")
 
         # Get suggestions
-        suggestions = app.config['resume_suggester'].analyze_resume(resume_data)
+        suggestions = get_llm_result_cached(
+            'resume_suggestions',
+            (resume_id, get_resume_version(resume_data)),
+            lambda: app.config['resume_suggester'].analyze_resume(resume_data)
+        )
         
         if not suggestions.get('success'):
             return render_template('error.html', 
@@ -2260,7 +2374,7 @@ def get_resume_suggestions(resume_id):
     """Get resume suggestions as JSON"""
     try:
         # Get resume data
-        resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id)
+        resume_data = get_resume_cached(resume_id)
         if not resume_data:
             return jsonify({
                 'success': False,
@@ -2268,7 +2382,11 @@ def get_resume_suggestions(resume_id):
             }), 404
 
         # Get suggestions
-        suggestions = app.config['resume_suggester'].analyze_resume(resume_data)
+        suggestions = get_llm_result_cached(
+            'resume_suggestions',
+            (resume_id, get_resume_version(resume_data)),
+            lambda: app.config['resume_suggester'].analyze_resume(resume_data)
+        )
         
         if not suggestions.get('success'):
             return jsonify({
@@ -2276,7 +2394,7 @@ def get_resume_suggestions(resume_id):
                 'error': suggestions.get('error', 'Failed to analyze resume')
             }), 500
 
-        return jsonify(suggestions)
+        return ojsonify(suggestions, direct_passthrough=True)
 
     except Exception as e:
         logger.error(f"Resume suggestions error: {str(e)}")
@@ -2403,6 +2521,124 @@ def clear_cache_by_type(cache_type):
         }), 500
 
 # Cache helper functions for consistent key generation
+def get_resume_cache_key(resume_id):
+    """Generate consistent cache key for a parsed resume"""
+    return f"resume:{resume_id}"
+
+def get_resume_cached(resume_id):
+    """Get a resume from the centralized cache, reading MongoDB only on a miss"""
+    cache_key = get_resume_cache_key(resume_id)
+    try:
+        resume_data = cache_get(cache_key)
+        if resume_data is not None:
+            return resume_data
+    except Exception as e:
+        logger.warning(f"Resume cache read failed for {resume_id}: {e}")
+
+    resume_data = app.config['resume_parser'].get_resume_by_id_sync(resume_id, ResumeParser.PAGE_PROJECTION)
+    if resume_data:
+        # Hand back the same shape a cache hit would, so callers don't see BSON types only on a miss
+        resume_data = cache_serialize(resume_data)
+        try:
+            cache_set(cache_key, resume_data, cache_type='resume', expiry_seconds=RESUME_CACHE_SECONDS)
+        except Exception as e:
+            logger.warning(f"Resume cache write failed for {resume_id}: {e}")
+    return resume_data
+
+def get_resume_version(resume_data):
+    """Stable version stamp for a resume, changing whenever it is saved"""
+    stamp = resume_data.get('updated_at') or resume_data.get('last_updated') or resume_data.get('upload_date')
+    return stamp.isoformat() if isinstance(stamp, datetime) else str(stamp)
+
+def get_llm_cache_key(kind, *inputs):
+    """Generate consistent cache key for an LLM result from the inputs it was generated from"""
+    digest = hashlib.blake2b(json.dumps(inputs, default=str).encode('utf-8'), digest_size=16).hexdigest()
+    return f"{kind}:{digest}"
+
+# LLM generations currently running, so identical concurrent requests share one call
+_llm_inflight = {}
+_llm_inflight_lock = threading.Lock()
+
+def get_llm_result_cached(kind, inputs, generate):
+    """Return a cached LLM result for these inputs, generating and caching it on a miss"""
+    cache_key = get_llm_cache_key(kind, *inputs)
+    try:
+        cached_result = cache_get(cache_key)
+        if cached_result is not None:
+            return cached_result
+    except Exception as e:
+        logger.warning(f"LLM cache read failed for {cache_key}: {e}")
+
+    with _llm_inflight_lock:
+        call = _llm_inflight.get(cache_key)
+        is_leader = call is None
+        if is_leader:
+            call = _llm_inflight[cache_key] = {'event': threading.Event(), 'result': None}
+
+    if not is_leader:
+        if call['event'].wait(LLM_INFLIGHT_TIMEOUT_SECONDS) and call['result'] is not None:
+            return copy.deepcopy(call['result'])
+        # The leading call failed or is stuck, so generate for this request
+        return generate()
+
+    try:
+        result = generate()
+        if result.get('success'):
+            try:
+                cache_set(cache_key, result, expiry_days=LLM_RESULT_CACHE_DAYS, cache_type=kind)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed for {cache_key}: {e}")
+        call['result'] = copy.deepcopy(result)
+        return result
+    finally:
+        with _llm_inflight_lock:
+            _llm_inflight.pop(cache_key, None)
+        call['event'].set()
+
+# Background refreshes for stale-while-revalidate results, at most one in flight per key
+_swr_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='swr-refresh')
+_swr_refreshing = set()
+_swr_lock = threading.Lock()
+
+def _store_swr_result(cache_key, kind, generate, hard_ttl):
+    """Generate a result and cache it together with its generation time"""
+    value = generate()
+    try:
+        cache_set(cache_key, {'value': value, 'generated_at': time.time()}, cache_type=kind, expiry_seconds=hard_ttl)
+    except Exception as e:
+        logger.warning(f"SWR cache write failed for {cache_key}: {e}")
+    return value
+
+def _refresh_swr_result(cache_key, kind, generate, hard_ttl):
+    """Regenerate a stale cached result off the request thread"""
+    try:
+        _store_swr_result(cache_key, kind, generate, hard_ttl)
+    except Exception as e:
+        logger.warning(f"Background refresh failed for {cache_key}: {e}")
+    finally:
+        with _swr_lock:
+            _swr_refreshing.discard(cache_key)
+
+def get_result_stale_while_revalidate(kind, inputs, generate, soft_ttl, hard_ttl):
+    """Serve a cached result at once, regenerating it in the background once older than soft_ttl"""
+    cache_key = get_llm_cache_key(kind, *inputs)
+    try:
+        cached = cache_get(cache_key)
+    except Exception as e:
+        logger.warning(f"SWR cache read failed for {cache_key}: {e}")
+        cached = None
+
+    if not cached or 'value' not in cached:
+        return _store_swr_result(cache_key, kind, generate, hard_ttl)
+
+    if time.time() - cached.get('generated_at', 0) > soft_ttl:
+        with _swr_lock:
+            start_refresh = cache_key not in _swr_refreshing
+            _swr_refreshing.add(cache_key)
+        if start_refresh:
+            _swr_refresh_pool.submit(_refresh_swr_result, cache_key, kind, generate, hard_ttl)
+    return cached['value']
+
 def get_profile_cache_key(profile_url):
     """Generate consistent cache key for profile analysis"""
     return f"profile_analysis:{profile_url}"
@@ -2971,10 +3207,7 @@ def regenerate_ats_resume(resume_id):
         # Generate new ATS resume with serialized data
         result = ats_generator.generate_ats_resume(resume_id, serialized_resume_data)
         
-        # Serialize the result to handle ObjectId conversion
-        serialized_result = serialize_resume_data(result)
-        
-        return jsonify(serialized_result)
+        return ojsonify(result)
 
     except Exception as e:
         logger.error(f"ATS Resume regeneration error: {str(e)}")
@@ -3238,33 +3471,6 @@ def regenerate_cover_letter():
             'error': str(e)
         }), 500
 
-@app.errorhandler(404)
-def not_found_error(error):
-    return render_template('404.html'), 404
-
-@app.errorhandler(500)
-def internal_error(error):
-    return render_template('500.html'), 500
-
-def serialize_resume_data(resume_data):
-    """Convert MongoDB ObjectId to string for JSON serialization"""
-    if isinstance(resume_data, list):
-        return [serialize_resume_data(item) for item in resume_data]
-    
-    if isinstance(resume_data, dict):
-        serialized = {}
-        for key, value in resume_data.items():
-            if isinstance(value, ObjectId):
-                serialized[key] = str(value)
-            elif isinstance(value, dict):
-                serialized[key] = serialize_resume_data(value)
-            elif isinstance(value, list):
-                serialized[key] = serialize_resume_data(value)
-            else:
-                serialized[key] = value
-        return serialized
-    
-    return resume_data
 if __name__ == '__main__':
     try:
         # Log final startup information
@@ -3290,7 +3496,6 @@ if __name__ == '__main__':
     finally:
         # Cleanup database connections on shutdown
         try:
-            from db_pool_manager import db_pool
             db_pool.close_all_connections()
             logger.info("Database connections closed cleanly")
         except Exception as e:
@@ -0,0 +1,59 @@
+"""Resume parsing in worker processes.
+
+Kept apart from the Flask apps so spawned workers import only this module and
+resume_parser, never the app factory.
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from resume_parser import ResumeParser
+
+# Parser owned by a worker process (see init_parse_worker)
+_worker_parser: Optional[ResumeParser] = None
+
+# Pool in the web process, started on the first parse
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def init_parse_worker() -> None:
+    """Give each parse worker process its own parser and MongoDB connection."""
+    global _worker_parser
+    _worker_parser = ResumeParser()
+
+
+def parse_resume_in_worker(file_path: str, user_id: str = None, original_filename: str = None) -> Dict:
+    """Parse an uploaded file in a worker process, then delete the temporary upload."""
+    try:
+        return _worker_parser.parse_resume(file_path, user_id, original_filename=original_filename)
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Return this process's parse pool, starting it on first use."""
+    global _parse_pool
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                # Spawned workers build their own ResumeParser rather than inheriting the Mongo client
+                _parse_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_parse_worker
+                )
+    return _parse_pool
+
+
+def parse_resume_in_pool(file_path: str, user_id: str = None, original_filename: str = None) -> Dict:
+    """Parse an uploaded file in the worker pool and wait for the result; the upload is removed."""
+    try:
+        future = get_parse_pool().submit(parse_resume_in_worker, file_path, user_id, original_filename)
+    except Exception:
+        os.remove(file_path)
+        raise
+    return future.result()
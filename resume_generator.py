@@ -16,7 +16,7 @@ import numpy as np
 # from init_databases import init_databases
 
 class ResumeGenerator:
-    def __init__(self):
+    def __init__(self, mongo_client: Optional[MongoClient] = None):
         """Initialize the resume generator."""
         load_dotenv()
         
@@ -28,7 +28,7 @@ class ResumeGenerator:
             self.embed_model = genai.GenerativeModel('embedding-001')
             
             # Initialize MongoDB
-            self.mongo_client = MongoClient("mongodb://127.0.0.1:27017")
+            self.mongo_client = mongo_client or MongoClient("mongodb://127.0.0.1:27017")
             self.db = self.mongo_client["resumeDB"]
             
             # Initialize ChromaDB
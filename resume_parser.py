@@ -1,3 +1,4 @@
+import io
 import os
 import logging
 from datetime import datetime
@@ -13,15 +14,20 @@ from pymongo import MongoClient
 from bson.objectid import ObjectId
 import gridfs
 class ResumeParser:
-    def __init__(self):
+    # Projection for page/API reads: drops the extracted text, which only parsing uses
+    PAGE_PROJECTION = {'raw_text': 0}
+
+    def __init__(self, mongo_client: Optional[MongoClient] = None):
         """Initialize resume parser with synchronous operations."""
         load_dotenv()
         try:
             # MongoDB setup
-            self.mongo_client = MongoClient("mongodb://localhost:27017")
+            self.mongo_client = mongo_client or MongoClient("mongodb://localhost:27017")
             self.db = self.mongo_client["resumeDB"]
             self.resumes = self.db["resumes"]
             self.fs = gridfs.GridFS(self.db)
+            # Per-user resume lists filter on user_id and sort newest first
+            self.resumes.create_index([("user_id", 1), ("upload_date", -1)])
 
             # Gemini setup
             genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
@@ -121,16 +127,36 @@ class ResumeParser:
             logging.error(f"Error getting resumes: {str(e)}")
             return []
     
-    def _extract_text(self, file_path: str) -> Optional[str]:
+    def iter_resumes(self, user_id: str = None, projection: Optional[Dict] = None):
+        """Iterate resumes newest first straight off the cursor, optionally filtered by user_id."""
+        query = {'user_id': user_id} if user_id else {}
+        return self.resumes.find(query, projection).sort('upload_date', -1)
+
+    def get_latest_resume_id_sync(self, user_id: str) -> Optional[str]:
+        """Return the id of the user's most recent resume, or None if they have none."""
+        try:
+            # Served from the (user_id, upload_date) index; only the _id comes back
+            resume = self.resumes.find_one({'user_id': user_id}, {'_id': 1}, sort=[('upload_date', -1)])
+            return str(resume['_id']) if resume else None
+        except Exception as e:
+            logging.error(f"Error getting latest resume: {str(e)}")
+            return None
+
+    @staticmethod
+    def _file_source(file_path: str, file_data: Optional[bytes] = None):
+        """Return an in-memory stream for uploaded bytes, otherwise the path on disk."""
+        return io.BytesIO(file_data) if file_data is not None else file_path
+
+    def _extract_text(self, file_path: str, file_data: Optional[bytes] = None) -> Optional[str]:
         """Extract text from resume file with multiple fallback methods."""
         try:
             file_ext = Path(file_path).suffix.lower()
             
             if file_ext == '.pdf':
                 # Try multiple PDF parsing methods
-                text = self._extract_pdf_text(file_path)
+                text = self._extract_pdf_text(file_path, file_data)
             elif file_ext in ['.doc', '.docx']:
-                doc = docx.Document(file_path)
+                doc = docx.Document(self._file_source(file_path, file_data))
                 text = ' '.join([paragraph.text for paragraph in doc.paragraphs])
             else:
                 raise ValueError(f"Unsupported file type: {file_ext}")
@@ -140,19 +166,18 @@ class ResumeParser:
             logging.error(f"Text extraction error: {str(e)}")
             return None
     
-    def _extract_pdf_text(self, file_path: str) -> Optional[str]:
+    def _extract_pdf_text(self, file_path: str, file_data: Optional[bytes] = None) -> Optional[str]:
         """Extract text from PDF using multiple fallback methods."""
         text = None
         
         # Method 1: Try PyPDF2
         try:
             logging.info(f"Attempting PDF extraction with PyPDF2 for: {file_path}")
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ' '.join([page.extract_text() for page in reader.pages])
-                if text and text.strip():
-                    logging.info("Successfully extracted text with PyPDF2")
-                    return text
+            reader = PyPDF2.PdfReader(self._file_source(file_path, file_data))
+            text = ' '.join([page.extract_text() for page in reader.pages])
+            if text and text.strip():
+                logging.info("Successfully extracted text with PyPDF2")
+                return text
         except Exception as e:
             logging.warning(f"PyPDF2 extraction failed: {str(e)}")
         
@@ -160,7 +185,7 @@ class ResumeParser:
         try:
             import pdfplumber
             logging.info(f"Attempting PDF extraction with pdfplumber for: {file_path}")
-            with pdfplumber.open(file_path) as pdf:
+            with pdfplumber.open(self._file_source(file_path, file_data)) as pdf:
                 text = ' '.join([page.extract_text() or '' for page in pdf.pages])
                 if text and text.strip():
                     logging.info("Successfully extracted text with pdfplumber")
@@ -174,7 +199,10 @@ class ResumeParser:
         try:
             import fitz  # PyMuPDF
             logging.info(f"Attempting PDF extraction with PyMuPDF for: {file_path}")
-            doc = fitz.open(file_path)
+            if file_data is not None:
+                doc = fitz.open(stream=file_data, filetype='pdf')
+            else:
+                doc = fitz.open(file_path)
             text = ' '.join([page.get_text() for page in doc])
             doc.close()
             if text and text.strip():
@@ -189,7 +217,7 @@ class ResumeParser:
         try:
             from pdfminer.high_level import extract_text
             logging.info(f"Attempting PDF extraction with pdfminer for: {file_path}")
-            text = extract_text(file_path)
+            text = extract_text(self._file_source(file_path, file_data))
             if text and text.strip():
                 logging.info("Successfully extracted text with pdfminer")
                 return text
@@ -217,17 +245,22 @@ class ResumeParser:
             logging.error(f"Response parsing error: {str(e)}")
             return {}
     
-    def parse_resume(self, file_path: str, user_id: str = None) -> Dict:
-        """Parse resume and extract information, store file in GridFS with user association."""
+    def parse_resume(self, file_path: str, user_id: str = None, file_data: Optional[bytes] = None,
+                     original_filename: Optional[str] = None) -> Dict:
+        """Parse resume and extract information, store file in GridFS with user association.
+
+        When file_data is given the upload is parsed from memory and file_path is only its filename.
+        original_filename is the name the user uploaded, when file_path was renamed on disk.
+        """
         try:
             # Step 1: Store the PDF file in GridFS first
-            original_filename = Path(file_path).name
-            file_id = self._store_file_in_gridfs(file_path, original_filename)
+            original_filename = original_filename or Path(file_path).name
+            file_id = self._store_file_in_gridfs(file_path, original_filename, file_data)
             if not file_id:
                 return {'success': False, 'error': 'Failed to store PDF file'}
 
             # Step 2: Extract text
-            text = self._extract_text(file_path)
+            text = self._extract_text(file_path, file_data)
             if not text:
                 logging.error(f"Text extraction failed for file: {file_path}")
                 return {
@@ -397,7 +430,7 @@ class ResumeParser:
             doc = {
                 'file_id': file_id,  # GridFS file reference
                 'original_filename': original_filename,
-                'file_size': os.path.getsize(file_path),
+                'file_size': len(file_data) if file_data is not None else os.path.getsize(file_path),
                 'file_type': Path(file_path).suffix.lower(),
                 'raw_text': text,
                 'parsed_data': parsed_data,
@@ -433,26 +466,33 @@ class ResumeParser:
             logging.error(f"Resume parsing error: {str(e)}")
             return {'success': False, 'error': str(e)}
 
-    def _store_file_in_gridfs(self, file_path: str, filename: str) -> Optional[str]:
+    def _store_file_in_gridfs(self, file_path: str, filename: str, file_data: Optional[bytes] = None) -> Optional[str]:
         """Store file in MongoDB GridFS."""
         try:
-            with open(file_path, 'rb') as f:
-                file_id = self.fs.put(
-                    f,
-                    filename=filename,
-                    content_type=self._get_content_type(file_path),
-                    upload_date=datetime.now(),
-                    metadata={
-                        'original_name': filename,
-                        'file_size': os.path.getsize(file_path)
-                    }
-                )
+            if file_data is not None:
+                file_id = self._put_file(file_data, filename, file_path, len(file_data))
+            else:
+                with open(file_path, 'rb') as f:
+                    file_id = self._put_file(f, filename, file_path, os.path.getsize(file_path))
             logging.info(f"Stored file in GridFS with ID: {file_id}")
             return file_id
         except Exception as e:
             logging.error(f"Error storing file in GridFS: {str(e)}")
             return None
 
+    def _put_file(self, data, filename: str, file_path: str, file_size: int):
+        """Write bytes or an open file into GridFS."""
+        return self.fs.put(
+            data,
+            filename=filename,
+            content_type=self._get_content_type(file_path),
+            upload_date=datetime.now(),
+            metadata={
+                'original_name': filename,
+                'file_size': file_size
+            }
+        )
+
     def _get_content_type(self, file_path: str) -> str:
         """Get content type based on file extension."""
         ext = Path(file_path).suffix.lower()
@@ -472,6 +512,14 @@ class ResumeParser:
             logging.error(f"Error retrieving file from GridFS: {str(e)}")
             return None
 
+    def open_resume_file(self, file_id: str) -> Optional[gridfs.GridOut]:
+        """Open original file from GridFS for streaming, without reading it into memory."""
+        try:
+            return self.fs.get(ObjectId(file_id))
+        except Exception as e:
+            logging.error(f"Error opening file from GridFS: {str(e)}")
+            return None
+
     def get_file_metadata(self, file_id: str) -> Optional[Dict]:
         """Get file metadata from GridFS."""
         try:
@@ -504,12 +552,12 @@ class ResumeParser:
             return None
     
 
-    def get_resume_by_id_sync(self, resume_id: str) -> Optional[Dict]:
-        """Get a specific resume by ID."""
+    def get_resume_by_id_sync(self, resume_id: str, projection: Optional[Dict] = None) -> Optional[Dict]:
+        """Get a specific resume by ID, optionally limited to a field projection."""
         try:
             # Convert string ID to ObjectId
             object_id = ObjectId(resume_id)
-            resume = self.resumes.find_one({"_id": object_id})
+            resume = self.resumes.find_one({"_id": object_id}, projection)
             
             if resume:
                 # Convert ObjectId to string for serialization
@@ -591,10 +639,12 @@ class ResumeParser:
             if 'personal_info' not in resume_data:
                 resume_data['personal_info'] = {}
 
-            # Add metadata
+            # Add metadata; last_updated moves too, since caches and ETags version resumes by it
+            now = datetime.now()
             resume_data.update({
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
+                'created_at': now,
+                'updated_at': now,
+                'last_updated': now,
                 'version': 1
             })
 
@@ -0,0 +1,66 @@
+"""
+Tests for ResumeParser.parse_resume's stored file metadata.
+MongoDB, GridFS and Gemini are replaced on the instance, so no services are needed.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+resume_parser = pytest.importorskip("resume_parser")
+
+
+class RecordingCollection:
+    """Collection stand-in that keeps inserted documents"""
+
+    def __init__(self):
+        self.inserted = []
+
+    def insert_one(self, doc):
+        self.inserted.append(doc)
+        return SimpleNamespace(inserted_id="resume-1")
+
+
+@pytest.fixture
+def parser():
+    """A ResumeParser with storage and the model call replaced"""
+    parser = resume_parser.ResumeParser.__new__(resume_parser.ResumeParser)
+    parser.resumes = RecordingCollection()
+    parser.gridfs_names = []
+
+    def store_file(file_path, filename, file_data=None):
+        parser.gridfs_names.append(filename)
+        return "file-1"
+
+    parser._store_file_in_gridfs = store_file
+    parser._extract_text = lambda file_path, file_data=None: "Jane Doe, Python developer"
+    parser._generate_text_sync = lambda prompt: "{}"
+    parser._clean_and_parse_response = lambda response: {
+        "personal_info": {"name": "Jane Doe"},
+        "projects": [{"name": "Resume AI"}],
+    }
+    parser._validate_and_fix_parsed_data = lambda data: data
+    parser._format_experience_data = lambda experience: experience
+    return parser
+
+
+def test_upload_keeps_the_users_filename(parser, tmp_path):
+    """A uuid-prefixed temp file is stored under the name the user uploaded"""
+    upload = tmp_path / "3f9c2b7e_cv.pdf"
+    upload.write_bytes(b"%PDF-1.4")
+
+    result = parser.parse_resume(str(upload), user_id="user-1", original_filename="cv.pdf")
+
+    assert result["success"] is True
+    assert parser.resumes.inserted[0]["original_filename"] == "cv.pdf"
+    assert parser.gridfs_names == ["cv.pdf"]
+
+
+def test_filename_defaults_to_the_file_on_disk(parser, tmp_path):
+    """Without an original_filename the file's own name is stored"""
+    upload = tmp_path / "cv.pdf"
+    upload.write_bytes(b"%PDF-1.4")
+
+    parser.parse_resume(str(upload))
+
+    assert parser.resumes.inserted[0]["original_filename"] == "cv.pdf"
@@ -1,12 +1,18 @@
 import os
+import copy
 import jwt
+import time
+import hashlib
+import hmac
+import secrets
+import threading
 import bcrypt
-import random
 import string
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 from pymongo import MongoClient
 from bson import ObjectId
+from cachetools import TTLCache
 import logging
 from dotenv import load_dotenv
 from send_mail import send_welcome_email, send_verification_email, send_password_reset_email
@@ -17,12 +23,55 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# JWT settings resolved once; every token this module issues carries these claims
+JWT_ALGORITHM = 'HS256'
+_JWT_DECODE_ALGORITHMS = [JWT_ALGORITHM]
+_JWT_DECODE_OPTIONS = {'require': ['exp', 'type', 'user_id']}
+
+# Recently verified JWT payloads by token digest, so repeat requests skip decoding
+_verified_tokens = TTLCache(maxsize=10_000, ttl=60)
+_verified_tokens_lock = threading.Lock()
+
+# User profiles by user id for the verify-token/profile hot path; writes through this
+# process drop the entry, other processes see changes within the TTL
+_user_profiles = TTLCache(maxsize=1024, ttl=60)
+_user_profiles_lock = threading.Lock()
+
+OTP_MAX_ATTEMPTS = 5  # Wrong guesses allowed before a pending OTP stops verifying
+
+# bcrypt releases the GIL, so hashing runs on the request thread; this caps concurrent hashes
+# at the core count so a login flood queues here instead of oversubscribing the CPU
+_bcrypt_slots = threading.BoundedSemaphore(os.cpu_count() or 2)
+
+# How long a refresh token keeps working after a new login replaced it, so a client racing
+# a refresh against the rotation doesn't get logged out
+REFRESH_TOKEN_GRACE_SECONDS = 10
+
+# Checked against on unknown-email logins so a miss costs the same bcrypt work as a wrong password
+_DUMMY_PASSWORD_HASH = bcrypt.hashpw(b'dummy-password', bcrypt.gensalt()).decode('utf-8')
+
+def _forget_verified_tokens(user_id) -> None:
+    """Drop a user's cached token payloads so their next request verifies from scratch"""
+    user_id = str(user_id)
+    with _verified_tokens_lock:
+        stale = [key for key, payload in _verified_tokens.items() if payload.get('user_id') == user_id]
+        for key in stale:
+            _verified_tokens.pop(key, None)
+
 class UserManager:
-    def __init__(self):
+    def __init__(self, mongo_client: Optional[MongoClient] = None):
         """Initialize the user management system"""
         try:
-            # MongoDB connection
-            self.mongo_client = MongoClient("mongodb://127.0.0.1:27017")
+            # MongoDB connection; every auth request goes through this pool, so keep warm
+            # connections around and fail fast instead of queueing behind a saturated pool
+            self.mongo_client = mongo_client or MongoClient(
+                "mongodb://127.0.0.1:27017",
+                maxPoolSize=100,
+                minPoolSize=10,
+                waitQueueTimeoutMS=2000,
+                serverSelectionTimeoutMS=2000,
+            )
+            self.mongo_client.admin.command('ping')
             self.db = self.mongo_client["resumeDB"]
             self.users_collection = self.db["users"]
             self.otps_collection = self.db["otps"]
@@ -32,7 +81,7 @@ class UserManager:
             
             # Create indexes for better performance
             self.users_collection.create_index("email", unique=True)
-            self.otps_collection.create_index("email")
+            self.otps_collection.create_index([("email", 1), ("purpose", 1)])
             self.otps_collection.create_index("expires_at", expireAfterSeconds=0)
             
             logger.info("User management system initialized successfully")
@@ -43,16 +92,18 @@ class UserManager:
 
     def generate_otp(self) -> str:
         """Generate a 6-digit OTP"""
-        return ''.join(random.choices(string.digits, k=6))
+        return ''.join(secrets.choice(string.digits) for _ in range(6))
 
     def hash_password(self, password: str) -> str:
         """Hash password using bcrypt"""
         salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        with _bcrypt_slots:
+            return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
     def verify_password(self, password: str, hashed: str) -> bool:
         """Verify password against hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        with _bcrypt_slots:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
     def generate_jwt_token(self, user_id: str, email: str) -> Dict[str, str]:
         """Generate JWT access and refresh tokens for user"""
@@ -64,7 +115,7 @@ class UserManager:
             'iat': datetime.utcnow(),
             'type': 'access'
         }
-        access_token = jwt.encode(access_payload, self.jwt_secret, algorithm='HS256')
+        access_token = jwt.encode(access_payload, self.jwt_secret, algorithm=JWT_ALGORITHM)
         
         # Refresh token (long-lived)
         refresh_payload = {
@@ -74,19 +125,23 @@ class UserManager:
             'iat': datetime.utcnow(),
             'type': 'refresh'
         }
-        refresh_token = jwt.encode(refresh_payload, self.jwt_secret, algorithm='HS256')
+        refresh_token = jwt.encode(refresh_payload, self.jwt_secret, algorithm=JWT_ALGORITHM)
         
-        # Store refresh token in database
+        # Store refresh token in database, keeping the one it replaces valid for a short grace window
         try:
+            now = datetime.utcnow()
             self.users_collection.update_one(
                 {'_id': ObjectId(user_id)},
-                {
+                [{
                     '$set': {
+                        'previous_refresh_token': '$refresh_token',
+                        'previous_refresh_valid_until': now + timedelta(seconds=REFRESH_TOKEN_GRACE_SECONDS),
                         'refresh_token': refresh_token,
-                        'last_login': datetime.utcnow()
+                        'last_login': now
                     }
-                }
+                }]
             )
+            self._forget_profile(user_id)
         except Exception as e:
             logger.error(f"Failed to store refresh token: {str(e)}")
         
@@ -97,9 +152,22 @@ class UserManager:
 
     def verify_jwt_token(self, token: str) -> Optional[Dict]:
         """Verify JWT token and return payload"""
+        token_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+        with _verified_tokens_lock:
+            cached = _verified_tokens.get(token_key)
+        if cached is not None:
+            # Cached entries live at most 60s, but never past the token's own expiry
+            if cached.get('exp', 0) > time.time():
+                return dict(cached)
+            with _verified_tokens_lock:
+                _verified_tokens.pop(token_key, None)
+            return None
+
         try:
-            payload = jwt.decode(token, self.jwt_secret, algorithms=['HS256'])
-            return payload
+            payload = jwt.decode(token, self.jwt_secret, algorithms=_JWT_DECODE_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
+            with _verified_tokens_lock:
+                _verified_tokens[token_key] = payload
+            return dict(payload)
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
@@ -109,7 +177,9 @@ class UserManager:
         """Generate new access token using refresh token"""
         try:
             # Verify refresh token
-            payload = jwt.decode(refresh_token, self.jwt_secret, algorithms=['HS256'])
+            payload = jwt.decode(
+                refresh_token, self.jwt_secret, algorithms=_JWT_DECODE_ALGORITHMS, options=_JWT_DECODE_OPTIONS
+            )
             
             # Check if it's a refresh token
             if payload.get('type') != 'refresh':
@@ -118,15 +188,26 @@ class UserManager:
             user_id = payload['user_id']
             email = payload['email']
             
-            # Verify refresh token exists in database
-            user = self.users_collection.find_one({
-                '_id': ObjectId(user_id),
-                'refresh_token': refresh_token
-            })
-            
+            # Verify refresh token matches the one stored for the user
+            user = self.users_collection.find_one(
+                {'_id': ObjectId(user_id)},
+                {'refresh_token': 1, 'previous_refresh_token': 1, 'previous_refresh_valid_until': 1}
+            )
             if not user:
                 return None
             
+            presented = refresh_token.encode('utf-8')
+            stored_token = user.get('refresh_token')
+            previous_token = user.get('previous_refresh_token')
+            matches_current = bool(stored_token) and hmac.compare_digest(stored_token.encode('utf-8'), presented)
+            matches_previous = (
+                bool(previous_token)
+                and user.get('previous_refresh_valid_until', datetime.min) > datetime.utcnow()
+                and hmac.compare_digest(previous_token.encode('utf-8'), presented)
+            )
+            if not (matches_current or matches_previous):
+                return None
+            
             # Generate new access token
             new_access_payload = {
                 'user_id': user_id,
@@ -135,7 +216,7 @@ class UserManager:
                 'iat': datetime.utcnow(),
                 'type': 'access'
             }
-            new_access_token = jwt.encode(new_access_payload, self.jwt_secret, algorithm='HS256')
+            new_access_token = jwt.encode(new_access_payload, self.jwt_secret, algorithm=JWT_ALGORITHM)
             
             return {
                 'access_token': new_access_token,
@@ -155,8 +236,10 @@ class UserManager:
         try:
             result = self.users_collection.update_one(
                 {'_id': ObjectId(user_id)},
-                {'$unset': {'refresh_token': ''}}
+                {'$unset': {'refresh_token': '', 'previous_refresh_token': '', 'previous_refresh_valid_until': ''}}
             )
+            self._forget_profile(user_id)
+            _forget_verified_tokens(user_id)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Failed to revoke refresh token: {str(e)}")
@@ -189,18 +272,16 @@ class UserManager:
                 'purpose': purpose,
                 'created_at': datetime.utcnow(),
                 'expires_at': datetime.utcnow() + timedelta(minutes=10),
-                'verified': False
+                'verified': False,
+                'attempts': 0
             }
             
-            # Remove any existing OTPs for this email and purpose
-            self.otps_collection.delete_many({
-                'email': email,
-                'purpose': purpose,
-                'verified': False
-            })
-            
-            # Insert new OTP
-            self.otps_collection.insert_one(otp_data)
+            # Replace any pending OTP for this email and purpose in one round-trip
+            self.otps_collection.replace_one(
+                {'email': email, 'purpose': purpose, 'verified': False},
+                otp_data,
+                upsert=True
+            )
             
             # Send email
             if self.send_otp_email(email, otp, purpose):
@@ -225,26 +306,35 @@ class UserManager:
     def verify_otp(self, email: str, otp: str, purpose: str = "verification") -> Dict:
         """Verify OTP for email"""
         try:
-            # Find OTP in database
-            otp_record = self.otps_collection.find_one({
-                'email': email,
-                'otp': otp,
-                'purpose': purpose,
-                'verified': False,
-                'expires_at': {'$gt': datetime.utcnow()}
-            })
+            # Claim an attempt on the pending OTP in the same write that checks the cap, so
+            # parallel guesses can't all pass the check before any of them is counted
+            otp_record = self.otps_collection.find_one_and_update(
+                {
+                    'email': email,
+                    'purpose': purpose,
+                    'verified': False,
+                    'expires_at': {'$gt': datetime.utcnow()},
+                    'attempts': {'$not': {'$gte': OTP_MAX_ATTEMPTS}}
+                },
+                {'$inc': {'attempts': 1}}
+            )
             
-            if not otp_record:
+            if not otp_record or not hmac.compare_digest(otp_record['otp'].encode('utf-8'), otp.encode('utf-8')):
                 return {
                     'success': False,
                     'error': 'Invalid or expired OTP'
                 }
             
             # Mark OTP as verified
-            self.otps_collection.update_one(
-                {'_id': otp_record['_id']},
+            result = self.otps_collection.update_one(
+                {'_id': otp_record['_id'], 'verified': False},
                 {'$set': {'verified': True, 'verified_at': datetime.utcnow()}}
             )
+            if result.modified_count == 0:
+                return {
+                    'success': False,
+                    'error': 'Invalid or expired OTP'
+                }
             
             return {
                 'success': True,
@@ -373,6 +463,8 @@ class UserManager:
             # Find user
             user = self.users_collection.find_one({'email': email})
             if not user:
+                # Burn a bcrypt check anyway so response time doesn't reveal which emails exist
+                self.verify_password(password, _DUMMY_PASSWORD_HASH)
                 return {
                     'success': False,
                     'error': 'Invalid email or password'
@@ -537,6 +629,7 @@ class UserManager:
                     }
                 }
             )
+            self._forget_profile(user_id)
             
             return {
                 'success': True,
@@ -550,8 +643,18 @@ class UserManager:
                 'error': str(e)
             }
 
+    def _forget_profile(self, user_id) -> None:
+        """Drop a cached profile after the user document changes"""
+        with _user_profiles_lock:
+            _user_profiles.pop(str(user_id), None)
+
     def get_user_profile(self, user_id: str) -> Dict:
         """Get user profile"""
+        with _user_profiles_lock:
+            cached = _user_profiles.get(user_id)
+        if cached is not None:
+            return {'success': True, 'user': copy.deepcopy(cached)}
+
         try:
             user = self.users_collection.find_one(
                 {'_id': ObjectId(user_id)},
@@ -566,6 +669,8 @@ class UserManager:
             
             # Convert ObjectId to string
             user['_id'] = str(user['_id'])
+            with _user_profiles_lock:
+                _user_profiles[user_id] = copy.deepcopy(user)
             
             return {
                 'success': True,
@@ -614,6 +719,7 @@ class UserManager:
                 {'_id': ObjectId(user_id)},
                 {'$set': update_data}
             )
+            self._forget_profile(user_id)
             
             if result.modified_count == 0:
                 return {
@@ -664,11 +770,16 @@ class UserManager:
             # Delete ATS resumes
             self.db.ats_resumes.delete_many({'user_id': user_id})
             
+            # Delete resume analytics
+            self.db.resume_analytics.delete_many({'user_id': user_id})
+            
             # Delete OTPs
             self.otps_collection.delete_many({'email': user['email']})
             
             # Delete user
             self.users_collection.delete_one({'_id': ObjectId(user_id)})
+            self._forget_profile(user_id)
+            _forget_verified_tokens(user_id)
             
             return {
                 'success': True,
@@ -718,10 +829,14 @@ class UserManager:
                         'updated_at': datetime.utcnow()
                     },
                     '$unset': {
-                        'refresh_token': ''  # Revoke refresh token
+                        'refresh_token': '',  # Revoke refresh token
+                        'previous_refresh_token': '',
+                        'previous_refresh_valid_until': ''
                     }
                 }
             )
+            self._forget_profile(user_id)
+            _forget_verified_tokens(user_id)
             
             if result.modified_count == 0:
                 return {